@@ -0,0 +1,666 @@
+import math
+import numpy as np
+
+from result_cache import LRUCache
+
+# Process-wide store for coverage results, shared by all sessions
+COVERAGE_CACHE = LRUCache(maxsize=128)
+
+
+# --- Exact Analytic Coverage Engine ---
+# Both radars sit on x = 0 and face each other along Y, so every region of
+# the passage map is symmetric in x. A horizontal slice at height y of an
+# annular sector is [lo(y), hi(y)] on the right half (mirrored on the left),
+# where hi/lo are lines (sector edges) or circles (R_max / blind arcs).
+# Areas are 2 * integral of max(0, min(hi) - max(lo)) dy, integrated exactly
+# between breakpoints where the active min/max function can change.
+#
+# Boundary functions x = f(y):
+#   ("line", k, y0)   -> k * (y - y0)
+#   ("circle", R, yc) -> sqrt(R^2 - (y - yc)^2), undefined outside |y - yc| <= R
+#   ("zero",)         -> 0
+
+ZERO = ("zero",)
+
+
+def _f_eval(f, y):
+    if f[0] == "line":
+        return f[1] * (y - f[2])
+    if f[0] == "circle":
+        t2 = f[1] ** 2 - (y - f[2]) ** 2
+        return math.sqrt(t2) if t2 >= 0 else -math.inf
+    return 0.0
+
+
+def _f_integral(f, y0, y1):
+    if f[0] == "line":
+        k, a = f[1], f[2]
+        return 0.5 * k * ((y1 - a) ** 2 - (y0 - a) ** 2)
+    if f[0] == "circle":
+        R, c = f[1], f[2]
+        if R <= 0:
+            return 0.0
+
+        def prim(y):
+            t = min(max(y - c, -R), R)
+            return 0.5 * (t * math.sqrt(R * R - t * t) + R * R * math.asin(t / R))
+        return prim(y1) - prim(y0)
+    return 0.0
+
+
+def _f_breaks(f):
+    """Points where a single function starts/stops being defined or crosses zero."""
+    if f[0] == "line":
+        return [f[2]]
+    if f[0] == "circle":
+        return [f[2] - f[1], f[2] + f[1]]
+    return []
+
+
+def _f_intersections(f, g):
+    """Heights y where f(y) == g(y) (may include spurious roots; they only add breakpoints)."""
+    if f[0] == "zero" or g[0] == "zero":
+        return []
+    if f[0] == "circle" and g[0] == "line":
+        f, g = g, f
+    if f[0] == "line" and g[0] == "line":
+        k1, a1, k2, a2 = f[1], f[2], g[1], g[2]
+        return [(k1 * a1 - k2 * a2) / (k1 - k2)] if k1 != k2 else []
+    if f[0] == "line" and g[0] == "circle":
+        k, a, R, c = f[1], f[2], g[1], g[2]
+        # k^2 (y - a)^2 = R^2 - (y - c)^2
+        qa = k * k + 1
+        qb = -2 * (k * k * a + c)
+        qc = k * k * a * a + c * c - R * R
+        disc = qb * qb - 4 * qa * qc
+        if disc < 0:
+            return []
+        sq = math.sqrt(disc)
+        return [(-qb - sq) / (2 * qa), (-qb + sq) / (2 * qa)]
+    # circle - circle: R1^2 - (y - c1)^2 = R2^2 - (y - c2)^2
+    R1, c1, R2, c2 = f[1], f[2], g[1], g[2]
+    if c1 == c2:
+        return []
+    return [((R1 * R1 - R2 * R2) / (c2 - c1) + c1 + c2) / 2]
+
+
+def _slice_area(his, los, y_lo, y_hi):
+    """Exact 2 * integral over [y_lo, y_hi] of max(0, min(his) - max(los))."""
+    if y_hi <= y_lo:
+        return 0.0
+    funcs = his + los
+    pts = {y_lo, y_hi}
+    for i, f in enumerate(funcs):
+        pts.update(_f_breaks(f))
+        for g in funcs[i + 1:]:
+            pts.update(_f_intersections(f, g))
+    pts = sorted(p for p in pts if y_lo <= p <= y_hi)
+
+    area = 0.0
+    for a, b in zip(pts[:-1], pts[1:]):
+        if b - a <= 0:
+            continue
+        mid = 0.5 * (a + b)
+        hi = min(his, key=lambda f: _f_eval(f, mid))
+        lo = max(los, key=lambda f: _f_eval(f, mid))
+        if _f_eval(hi, mid) - _f_eval(lo, mid) > 0:
+            area += _f_integral(hi, a, b) - _f_integral(lo, a, b)
+    return 2.0 * area
+
+
+def _sector_funcs(y_radar, facing_up, r_out, r_in, scan_limit_deg):
+    """Slice boundaries of an annular sector for a radar on x = 0."""
+    his = [("circle", r_out, y_radar)]
+    if scan_limit_deg < 90:
+        k = math.tan(math.radians(scan_limit_deg))
+        # |x| <= tan(scan) * distance along boresight
+        his.append(("line", k if facing_up else -k, y_radar))
+    los = [ZERO]
+    if r_in > 0:
+        los.append(("circle", r_in, y_radar))
+    return his, los
+
+
+def calculate_dual_coverage_exact(r1_active, r2_active, radar_sep, r_max, blind_zone_m, scan_limit_deg):
+    """Calculates the dual-radar passage areas analytically.
+
+    Same geometry and keys as calculate_dual_coverage (Radar 1 at (0,0)
+    facing +Y, valid for y <= sep; Radar 2 at (0,sep) facing -Y, valid for
+    y >= 0), plus the union of the occlusion-clipped blind zones.
+    """
+    his1, los1 = _sector_funcs(0.0, True, r_max, blind_zone_m, scan_limit_deg)
+    his2, los2 = _sector_funcs(radar_sep, False, r_max, blind_zone_m, scan_limit_deg)
+
+    # Sector 1 lives in y in [0, r_max]; sector 2 in [sep - r_max, sep]
+    a1_total = _slice_area(his1, los1, 0.0, r_max) if r1_active else 0.0
+    a1_valid = _slice_area(his1, los1, 0.0, min(radar_sep, r_max)) if r1_active else 0.0
+    a2_total = _slice_area(his2, los2, radar_sep - r_max, radar_sep) if r2_active else 0.0
+    a2_valid = _slice_area(his2, los2, max(0.0, radar_sep - r_max), radar_sep) if r2_active else 0.0
+
+    area_intersect = 0.0
+    if r1_active and r2_active:
+        area_intersect = _slice_area(his1 + his2, los1 + los2, max(0.0, radar_sep - r_max), min(radar_sep, r_max))
+
+    # Blind sectors (radius blind_zone_m), clipped by the same occlusion line
+    area_blind = 0.0
+    if blind_zone_m > 0:
+        bh1, _ = _sector_funcs(0.0, True, blind_zone_m, 0.0, scan_limit_deg)
+        bh2, _ = _sector_funcs(radar_sep, False, blind_zone_m, 0.0, scan_limit_deg)
+        if r1_active:
+            area_blind += _slice_area(bh1, [ZERO], 0.0, min(radar_sep, blind_zone_m))
+        if r2_active:
+            area_blind += _slice_area(bh2, [ZERO], max(0.0, radar_sep - blind_zone_m), radar_sep)
+        if r1_active and r2_active:
+            # Union: facing blind sectors overlap when sep < 2 * blind_zone_m
+            area_blind -= _slice_area(bh1 + bh2, [ZERO], max(0.0, radar_sep - blind_zone_m), min(radar_sep, blind_zone_m))
+
+    return {
+        "area_union": a1_valid + a2_valid - area_intersect,
+        "area_intersect": area_intersect,
+        "area_r1_only": a1_valid - area_intersect,
+        "area_r2_only": a2_valid - area_intersect,
+        "area_blocked": (a1_total - a1_valid) + (a2_total - a2_valid),
+        "area_blind": area_blind,
+    }
+
+
+# --- Adaptive Quadtree Rasterizer ---
+# Each primitive test is evaluated on whole axis-aligned blocks and returns
+# bounds (lo, hi): lo = every point of the block is inside, hi = some point
+# may be inside. Regions are built with AND / OR / NOT on these bounds, and
+# a block whose regions all have lo == hi is uniform and never subdivided.
+# A degenerate block (x0 == x1, y0 == y1) is an exact point test.
+
+def _tri_and(*terms):
+    lo = terms[0][0].copy()
+    hi = terms[0][1].copy()
+    for t_lo, t_hi in terms[1:]:
+        lo &= t_lo
+        hi &= t_hi
+    return lo, hi
+
+
+def _tri_or(*terms):
+    lo = terms[0][0].copy()
+    hi = terms[0][1].copy()
+    for t_lo, t_hi in terms[1:]:
+        lo |= t_lo
+        hi |= t_hi
+    return lo, hi
+
+
+def _tri_not(term):
+    return ~term[1], ~term[0]
+
+
+def _tri_const(value, shape):
+    return np.full(shape, value, dtype=bool), np.full(shape, value, dtype=bool)
+
+
+def _box_disk(cx, cy, r, x0, y0, x1, y1):
+    """Bounds of (distance to (cx, cy) <= r) over blocks."""
+    dx_min = np.maximum(np.maximum(x0 - cx, cx - x1), 0.0)
+    dy_min = np.maximum(np.maximum(y0 - cy, cy - y1), 0.0)
+    dx_max = np.maximum(np.abs(x0 - cx), np.abs(x1 - cx))
+    dy_max = np.maximum(np.abs(y0 - cy), np.abs(y1 - cy))
+    return dx_max ** 2 + dy_max ** 2 <= r * r, dx_min ** 2 + dy_min ** 2 <= r * r
+
+
+def _box_halfplane(nx, ny, c, x0, y0, x1, y1):
+    """Bounds of (nx * x + ny * y >= c) over blocks."""
+    fx_lo = np.minimum(nx * x0, nx * x1)
+    fx_hi = np.maximum(nx * x0, nx * x1)
+    fy_lo = np.minimum(ny * y0, ny * y1)
+    fy_hi = np.maximum(ny * y0, ny * y1)
+    return fx_lo + fy_lo >= c, fx_hi + fy_hi >= c
+
+
+def _box_wedge(cx, cy, boresight_deg, scan_limit_deg, x0, y0, x1, y1):
+    """Bounds of (|angle from boresight| <= scan) for a radar at (cx, cy)."""
+    a_left = math.radians(boresight_deg + scan_limit_deg)
+    a_right = math.radians(boresight_deg - scan_limit_deg)
+    # Inward normals of the two sector edges
+    n1 = (math.sin(a_left), -math.cos(a_left))
+    n2 = (-math.sin(a_right), math.cos(a_right))
+    h1 = _box_halfplane(n1[0], n1[1], n1[0] * cx + n1[1] * cy, x0, y0, x1, y1)
+    h2 = _box_halfplane(n2[0], n2[1], n2[0] * cx + n2[1] * cy, x0, y0, x1, y1)
+    # Convex cone up to +-90 deg, union of half-planes beyond
+    return _tri_and(h1, h2) if scan_limit_deg <= 90 else _tri_or(h1, h2)
+
+
+def _dual_regions(r1_active, r2_active, radar_sep, r_max, blind_zone_m, scan_limit_deg):
+    """Region bound function for the head-to-head dual-radar geometry."""
+    def regions(x0, y0, x1, y1):
+        shape = np.shape(x0)
+        below_sep = _box_halfplane(0.0, -1.0, -radar_sep, x0, y0, x1, y1)  # y <= sep
+        above_0 = _box_halfplane(0.0, 1.0, 0.0, x0, y0, x1, y1)            # y >= 0
+
+        def radar(active, cy, boresight, valid_side):
+            if not active:
+                off = _tri_const(False, shape)
+                return off, off, off
+            wedge = _box_wedge(0.0, cy, boresight, scan_limit_deg, x0, y0, x1, y1)
+            in_blind = _box_disk(0.0, cy, blind_zone_m, x0, y0, x1, y1)
+            sector = _tri_and(wedge, _box_disk(0.0, cy, r_max, x0, y0, x1, y1), _tri_not(in_blind))
+            valid = _tri_and(sector, valid_side)
+            blocked = _tri_and(sector, _tri_not(valid_side))
+            blind = _tri_and(wedge, in_blind, valid_side)
+            return valid, blocked, blind
+
+        v1, b1, bl1 = radar(r1_active, 0.0, 90.0, below_sep)
+        v2, b2, bl2 = radar(r2_active, radar_sep, 270.0, above_0)
+        return {
+            "area_union": _tri_or(v1, v2),
+            "area_intersect": _tri_and(v1, v2),
+            "area_r1_only": _tri_and(v1, _tri_not(v2)),
+            "area_r2_only": _tri_and(v2, _tri_not(v1)),
+            "area_blocked": _tri_or(b1, b2),
+            "area_blind": _tri_or(bl1, bl2),
+        }
+    return regions
+
+
+def quadtree_integrate(regions, x_min, y_min, x_max, y_max, min_cell=0.01, batch=1 << 18):
+    """Integrates region areas with an adaptive quadtree.
+
+    Uniform blocks are accepted whole; mixed blocks are split in four until
+    they reach min_cell, where the block is classified by its center (the
+    same rule as a uniform raster at that resolution). Work is processed
+    in batches of at most `batch` blocks, bounding memory. Returns
+    (areas, n_evaluations).
+    """
+    # Root blocks: power-of-two multiples of min_cell covering the extent
+    extent = max(x_max - x_min, y_max - y_min)
+    levels = max(0, int(math.ceil(math.log2(max(extent / min_cell, 1.0)))))
+    root = min_cell * 2 ** min(levels, 6)
+    nx = int(math.ceil((x_max - x_min) / root))
+    ny = int(math.ceil((y_max - y_min) / root))
+    gx, gy = np.meshgrid(x_min + root * np.arange(nx), y_min + root * np.arange(ny))
+
+    stack = [(gx.ravel(), gy.ravel(), root)]
+    areas = None
+    n_eval = 0
+
+    while stack:
+        x0, y0, size = stack.pop()
+        if len(x0) > batch:
+            stack.append((x0[batch:], y0[batch:], size))
+            x0, y0 = x0[:batch], y0[:batch]
+        n_eval += len(x0)
+
+        finest = size <= min_cell * (1 + 1e-9)
+        if finest:
+            xc, yc = x0 + size / 2, y0 + size / 2
+            bounds = regions(xc, yc, xc, yc)
+        else:
+            bounds = regions(x0, y0, x0 + size, y0 + size)
+
+        if areas is None:
+            areas = {k: 0.0 for k in bounds}
+        mixed = np.zeros(len(x0), dtype=bool)
+        for lo, hi in bounds.values():
+            mixed |= lo != hi
+        for k, (lo, hi) in bounds.items():
+            areas[k] += np.count_nonzero(lo & ~mixed) * size * size
+
+        if not finest and np.any(mixed):
+            half = size / 2
+            mx, my = x0[mixed], y0[mixed]
+            cx = np.concatenate([mx, mx + half, mx, mx + half])
+            cy = np.concatenate([my, my, my + half, my + half])
+            stack.append((cx, cy, half))
+
+    return areas or {}, n_eval
+
+
+def calculate_dual_coverage_quadtree(r1_active, r2_active, radar_sep, r_max, blind_zone_m, scan_limit_deg, min_cell=0.01):
+    """Calculates the dual-radar passage areas with an adaptive quadtree raster.
+
+    Same extent and keys as calculate_dual_coverage; only blocks crossed by
+    sector edges, arcs or occlusion lines are refined down to min_cell.
+    """
+    extent = r_max + 5.0
+    midpoint = radar_sep / 2.0
+    regions = _dual_regions(r1_active, r2_active, radar_sep, r_max, blind_zone_m, scan_limit_deg)
+    areas, n_eval = quadtree_integrate(regions, -extent, midpoint - extent, extent, midpoint + extent, min_cell=min_cell)
+
+    areas["n_evaluations"] = n_eval
+    return areas
+
+
+# --- Chunked Low-Memory Raster ---
+# Same grid and tests as calculate_dual_coverage, evaluated in row blocks.
+# Coordinates are float32 and broadcast (column of y, row of x), so no full
+# meshgrid exists; every mask is packed to 1 bit per cell right after it is
+# computed and combined with bitwise ops. Packed padding bits are 0 and
+# every NOT is ANDed with another packed mask, so the padding never counts.
+
+# Approximate live bytes per cell in one block (float32 temporaries + bool + packed masks)
+_CHUNK_BYTES_PER_CELL = 32
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _popcount(packed):
+    return int(np.sum(_POPCOUNT[packed], dtype=np.int64))
+
+
+def calculate_dual_coverage_chunked(r1_active, r2_active, radar_sep, r_max, blind_zone_m, scan_limit_deg, grid_res, mem_budget_mb=64):
+    """Calculates calculate_dual_coverage's grid areas with bounded peak memory.
+
+    Rows are processed in blocks sized so that the working set stays within
+    mem_budget_mb, independent of arena size and grid resolution. Also
+    returns the blind-zone union (area_blind), as the exact and quadtree
+    engines do.
+    """
+    midpoint = radar_sep / 2.0
+    y_extent = r_max + 5.0
+    half_y = np.arange(grid_res/2, y_extent, grid_res)
+    y_grid = (np.concatenate((-half_y[::-1], half_y)) + midpoint).astype(np.float32)
+
+    x_extent = r_max + 5.0
+    half_x = np.arange(grid_res/2, x_extent, grid_res)
+    x_grid = np.concatenate((-half_x[::-1], half_x)).astype(np.float32)[np.newaxis, :]
+
+    nx = x_grid.shape[1]
+    rows = max(1, int(mem_budget_mb * 2**20 // (nx * _CHUNK_BYTES_PER_CELL)))
+
+    scan_rad = math.radians(scan_limit_deg)
+    cos_scan = np.float32(math.cos(scan_rad))
+    half_pi = np.float32(np.pi / 2)
+    sep32 = np.float32(radar_sep)
+    counts = {"union": 0, "intersect": 0, "r1_only": 0, "r2_only": 0, "blocked": 0, "blind": 0}
+
+    for r0 in range(0, len(y_grid), rows):
+        yy = y_grid[r0:r0 + rows, np.newaxis]
+
+        # --- Radar 1 (At 0,0 facing +Y) ---
+        if r1_active:
+            r1_dist = np.sqrt(x_grid**2 + yy**2)
+            wedge = np.abs(np.arctan2(yy, x_grid) - half_pi) <= scan_rad
+            below = np.broadcast_to(yy <= sep32, wedge.shape)
+            r1_blind = np.packbits(wedge & (r1_dist < blind_zone_m) & below)
+            theo = wedge & (r1_dist >= blind_zone_m) & (r1_dist <= r_max)
+            del r1_dist, wedge
+            r1_valid = np.packbits(theo & below)
+            r1_blocked = np.packbits(theo & ~below)
+            del theo
+        else:
+            r1_valid = r1_blocked = r1_blind = np.packbits(np.zeros((len(yy), nx), dtype=bool))
+
+        # --- Radar 2 (At 0,Sep facing -Y) ---
+        if r2_active:
+            dy2 = yy - sep32
+            r2_dist = np.sqrt(x_grid**2 + dy2**2)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                cos_alpha = -dy2 / r2_dist
+            cos_alpha = np.nan_to_num(cos_alpha, nan=-1.0)
+            wedge = cos_alpha >= cos_scan
+            above = np.broadcast_to(yy >= 0, wedge.shape)
+            r2_blind = np.packbits(wedge & (r2_dist < blind_zone_m) & above)
+            theo = wedge & (r2_dist >= blind_zone_m) & (r2_dist <= r_max)
+            del r2_dist, cos_alpha, wedge
+            r2_valid = np.packbits(theo & above)
+            r2_blocked = np.packbits(theo & ~above)
+            del theo
+        else:
+            r2_valid = r2_blocked = r2_blind = np.packbits(np.zeros((len(yy), nx), dtype=bool))
+
+        counts["union"] += _popcount(r1_valid | r2_valid)
+        counts["intersect"] += _popcount(r1_valid & r2_valid)
+        counts["r1_only"] += _popcount(r1_valid & ~r2_valid)
+        counts["r2_only"] += _popcount(r2_valid & ~r1_valid)
+        counts["blocked"] += _popcount(r1_blocked | r2_blocked)
+        counts["blind"] += _popcount(r1_blind | r2_blind)
+
+    cell_area = grid_res * grid_res
+    area_r1_only = counts["r1_only"] * cell_area
+    area_r2_only = counts["r2_only"] * cell_area
+
+    # Safety Equalizer (Strict Symmetry Logic), as in calculate_dual_coverage
+    if r1_active and r2_active:
+        avg_area = (area_r1_only + area_r2_only) / 2.0
+        area_r1_only = avg_area
+        area_r2_only = avg_area
+
+    return {
+        "area_union": counts["union"] * cell_area,
+        "area_intersect": counts["intersect"] * cell_area,
+        "area_r1_only": area_r1_only,
+        "area_r2_only": area_r2_only,
+        "area_blocked": counts["blocked"] * cell_area,
+        "area_blind": counts["blind"] * cell_area,
+    }
+
+
+# --- Generalized N-Radar Coverage ---
+def radar_pose(x, y, boresight_deg, scan_limit_deg, r_max, blind_zone_m=0.0, valid_halfplanes=(),
+               height=0.0, tilt_deg=0.0, elev_scan_deg=90.0):
+    """One radar install. valid_halfplanes: (nx, ny, c) tuples, visible where nx*x + ny*y >= c.
+
+    height, tilt_deg (downward positive) and elev_scan_deg (+- about the
+    tilted boresight) are only used by the 3D volume coverage.
+    """
+    return {
+        "x": x,
+        "y": y,
+        "boresight_deg": boresight_deg,
+        "scan_limit_deg": scan_limit_deg,
+        "r_max": r_max,
+        "blind_zone_m": blind_zone_m,
+        "valid_halfplanes": tuple(valid_halfplanes),
+        "height": height,
+        "tilt_deg": tilt_deg,
+        "elev_scan_deg": elev_scan_deg,
+    }
+
+
+def dual_radar_layout(radar_sep, r_max, blind_zone_m, scan_limit_deg, r1_active=True, r2_active=True,
+                      height=0.0, tilt_deg=0.0, elev_scan_deg=90.0):
+    """The head-to-head passage setup expressed as generic radar poses."""
+    mount = dict(height=height, tilt_deg=tilt_deg, elev_scan_deg=elev_scan_deg)
+    radars = []
+    if r1_active:
+        # Radar 1 at (0,0) facing +Y, valid for y <= sep
+        radars.append(radar_pose(0.0, 0.0, 90.0, scan_limit_deg, r_max, blind_zone_m, [(0.0, -1.0, -radar_sep)], **mount))
+    if r2_active:
+        # Radar 2 at (0,sep) facing -Y, valid for y >= 0
+        radars.append(radar_pose(0.0, radar_sep, 270.0, scan_limit_deg, r_max, blind_zone_m, [(0.0, 1.0, 0.0)], **mount))
+    return radars
+
+
+def coverage_bounds(radars, margin=5.0):
+    """Raster extent (x_min, y_min, x_max, y_max) enclosing every radar's r_max plus a margin.
+
+    An empty radar list (e.g. both radars of dual_radar_layout disabled) gives an empty extent.
+    """
+    if not radars:
+        return (0.0, 0.0, 0.0, 0.0)
+    reach = max(r["r_max"] for r in radars) + margin
+    return (min(r["x"] for r in radars) - reach, min(r["y"] for r in radars) - reach,
+            max(r["x"] for r in radars) + reach, max(r["y"] for r in radars) + reach)
+
+
+def raster_grid(bounds, grid_res):
+    """float32 cell-center coordinates (x_grid, y_grid) of the raster over bounds."""
+    x_min, y_min, x_max, y_max = bounds
+    x_grid = (x_min + grid_res / 2 + grid_res * np.arange(int(round((x_max - x_min) / grid_res)))).astype(np.float32)
+    y_grid = (y_min + grid_res / 2 + grid_res * np.arange(int(round((y_max - y_min) / grid_res)))).astype(np.float32)
+    return x_grid, y_grid
+
+
+def _stack_radars(radars):
+    """Per-radar parameters as (N, 1, 1) arrays, half-planes padded to (N, H, 1, 1)."""
+    def col(key):
+        return np.array([r[key] for r in radars], dtype=np.float32)[:, None, None]
+
+    bore = np.radians([r["boresight_deg"] for r in radars])
+    n_hp = max([len(r["valid_halfplanes"]) for r in radars] + [1])
+    hp = np.zeros((len(radars), n_hp, 3), dtype=np.float32)
+    hp[:, :, 2] = -np.inf  # padding: always visible
+    for i, r in enumerate(radars):
+        if r["valid_halfplanes"]:
+            hp[i, :len(r["valid_halfplanes"])] = r["valid_halfplanes"]
+
+    return {
+        "x": col("x"),
+        "y": col("y"),
+        "bx": np.cos(bore).astype(np.float32)[:, None, None],
+        "by": np.sin(bore).astype(np.float32)[:, None, None],
+        "cos_scan": np.cos(np.radians([r["scan_limit_deg"] for r in radars])).astype(np.float32)[:, None, None],
+        "r_max": col("r_max"),
+        "blind": col("blind_zone_m"),
+        "hp": hp[:, :, :, None, None],
+        "h": col("height"),
+        "el_lo": np.radians(-col("tilt_deg") - col("elev_scan_deg")),
+        "el_hi": np.radians(-col("tilt_deg") + col("elev_scan_deg")),
+    }
+
+
+def calculate_multi_coverage(radars, grid_res, bounds=None, mem_budget_mb=64, return_raster=False, visibility=None):
+    """Calculates coverage of any number of radars on a raster.
+
+    Every radar test (range, blind zone, scan limit, occlusion half-planes)
+    is vectorized over a leading radar axis and rows are processed in blocks
+    within mem_budget_mb. Tracks how many radars see each cell.
+
+    Returns k-coverage areas (area_k[k] = area seen by at least k radars),
+    per-radar valid / blocked areas, union blocked and blind areas, and the
+    uint8 coverage-count raster when return_raster is True.
+
+    visibility optionally gives one boolean raster per radar (or None) on the
+    same grid, e.g. obstacle line-of-sight masks; hidden cells count as
+    blocked.
+    """
+    n = len(radars)
+    if bounds is None:
+        bounds = coverage_bounds(radars)
+    x_grid, y_grid = raster_grid(bounds, grid_res)
+
+    p = _stack_radars(radars)
+    nx = len(x_grid)
+    # float32 temporaries per radar plus the per-cell count
+    bytes_per_cell = n * 24 + 8
+    rows = max(1, int(mem_budget_mb * 2**20 // (max(nx, 1) * bytes_per_cell)))
+
+    hist = np.zeros(n + 1, dtype=np.int64)
+    valid_cells = np.zeros(n, dtype=np.int64)
+    blocked_cells = np.zeros(n, dtype=np.int64)
+    blocked_union = 0
+    blind_union = 0
+    raster = np.zeros((len(y_grid), nx), dtype=np.uint8) if return_raster else None
+
+    xx = x_grid[np.newaxis, np.newaxis, :]
+    for r0 in range(0, len(y_grid), rows):
+        yy = y_grid[np.newaxis, r0:r0 + rows, np.newaxis]
+
+        dx = xx - p["x"]
+        dy = yy - p["y"]
+        dist = np.sqrt(dx * dx + dy * dy)                  # (N, rows, nx)
+        wedge = (dx * p["bx"] + dy * p["by"]) >= dist * p["cos_scan"]
+        in_blind = wedge & (dist < p["blind"])
+        sector = wedge & (dist >= p["blind"]) & (dist <= p["r_max"])
+        del dist, wedge
+
+        visible = np.all(p["hp"][:, :, 0] * xx + p["hp"][:, :, 1] * yy >= p["hp"][:, :, 2], axis=1)
+        if visibility is not None:
+            for i, vis in enumerate(visibility):
+                if vis is not None:
+                    visible[i] &= vis[r0:r0 + rows]
+        valid = sector & visible
+        blocked = sector & ~visible
+        in_blind &= visible
+
+        count = np.sum(valid, axis=0, dtype=np.uint8)
+        hist += np.bincount(count.ravel(), minlength=n + 1)
+        valid_cells += np.count_nonzero(valid, axis=(1, 2))
+        blocked_cells += np.count_nonzero(blocked, axis=(1, 2))
+        blocked_union += np.count_nonzero(np.any(blocked, axis=0))
+        blind_union += np.count_nonzero(np.any(in_blind, axis=0))
+        if return_raster:
+            raster[r0:r0 + rows] = count
+
+    cell_area = grid_res * grid_res
+    # area_k[k]: area covered by at least k radars
+    area_k = np.cumsum(hist[::-1])[::-1] * cell_area
+    result = {
+        "area_k": area_k,
+        "area_union": area_k[1] if n > 0 else 0.0,
+        "area_valid": valid_cells * cell_area,
+        "area_blocked": blocked_cells * cell_area,
+        "area_blocked_union": blocked_union * cell_area,
+        "area_blind": blind_union * cell_area,
+        "x_grid": x_grid,
+        "y_grid": y_grid,
+    }
+    if return_raster:
+        result["coverage_count"] = raster
+    return result
+
+
+def radar_region_masks(radars, x, y):
+    """Per-radar valid / blocked / blind tests at arbitrary points.
+
+    Returns three bool arrays of shape (N,) + broadcast(x, y).shape with the
+    same definitions as calculate_multi_coverage.
+    """
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=np.float32), np.asarray(y, dtype=np.float32))
+    shape = (len(radars),) + x.shape
+    p = _stack_radars(radars)
+    xx = x.reshape(1, 1, -1)
+    yy = y.reshape(1, 1, -1)
+
+    dx = xx - p["x"]
+    dy = yy - p["y"]
+    dist = np.sqrt(dx * dx + dy * dy)
+    wedge = (dx * p["bx"] + dy * p["by"]) >= dist * p["cos_scan"]
+    sector = wedge & (dist >= p["blind"]) & (dist <= p["r_max"])
+    visible = np.all(p["hp"][:, :, 0] * xx + p["hp"][:, :, 1] * yy >= p["hp"][:, :, 2], axis=1)
+    valid = sector & visible
+    blocked = sector & ~visible
+    blind = wedge & (dist < p["blind"]) & visible
+    return valid.reshape(shape), blocked.reshape(shape), blind.reshape(shape)
+
+
+def radar_coverage_mask(radars, x, y):
+    """Per-radar valid-coverage test at arbitrary points: bool array of shape (N,) + broadcast(x, y).shape."""
+    return radar_region_masks(radars, x, y)[0]
+
+
+# --- Wedge Polygons (Plot Outlines) ---
+def wedge_polygon(cx, cy, r_in, r_out, center_deg, half_fov_deg, valid_halfplanes=(), shadow=False, n_points=150):
+    """Outline of an annular wedge, clipped along each ray at the occlusion half-planes.
+
+    valid_halfplanes follow radar_pose: visible where nx*x + ny*y >= c, with
+    the radar inside all of them. Each ray is visible from r_in up to the
+    first half-plane boundary; shadow=True returns the occluded remainder
+    out to r_out instead. Returns closed (x, y) arrays of 2*n_points + 1.
+    """
+    th = np.radians(np.linspace(center_deg - half_fov_deg, center_deg + half_fov_deg, n_points))
+    cos_t = np.cos(th)
+    sin_t = np.sin(th)
+
+    # Ray leaves half-plane i at r = g_i / d_i, only where d_i < 0 (moving outward)
+    r_cut = np.full(n_points, np.inf)
+    for nx, ny, c in valid_halfplanes:
+        d = nx * cos_t + ny * sin_t
+        g = c - (nx * cx + ny * cy)
+        leaving = d < -1e-6
+        r_cut[leaving] = np.minimum(r_cut[leaving], g / d[leaving])
+    r_cut = np.clip(r_cut, r_in, r_out)
+
+    r_inner = r_cut if shadow else np.full(n_points, float(r_in))
+    r_outer = np.full(n_points, float(r_out)) if shadow else r_cut
+
+    # Inner arc forward, outer arc reversed, closed at the first point
+    x_poly = np.concatenate([cx + r_inner * cos_t, cx + r_outer[::-1] * cos_t[::-1], [cx + r_inner[0] * cos_t[0]]])
+    y_poly = np.concatenate([cy + r_inner * sin_t, cy + r_outer[::-1] * sin_t[::-1], [cy + r_inner[0] * sin_t[0]]])
+    return x_poly, y_poly
+
+
+def radar_wedge_polygon(radar, part="valid", n_points=150):
+    """Plot outline of one radar_pose: part is "valid", "shadow" or "blind"."""
+    if part == "blind":
+        return wedge_polygon(radar["x"], radar["y"], 0.0, radar["blind_zone_m"], radar["boresight_deg"],
+                             radar["scan_limit_deg"], n_points=n_points)
+    return wedge_polygon(radar["x"], radar["y"], radar["blind_zone_m"], radar["r_max"], radar["boresight_deg"],
+                         radar["scan_limit_deg"], radar["valid_halfplanes"], shadow=(part == "shadow"), n_points=n_points)
@@ -0,0 +1,181 @@
+import json
+import os
+
+import numpy as np
+
+from coverage_engine import dual_radar_layout, radar_region_masks
+
+# Per-cell coverage classes of the dual-radar layout
+CLASS_NONE = 0
+CLASS_R1_ONLY = 1
+CLASS_R2_ONLY = 2
+CLASS_BOTH = 3
+CLASS_BLOCKED = 4
+CLASS_BLIND = 5
+CLASS_NODATA = 255  # padding of edge tiles
+
+CLASS_NAMES = {
+    CLASS_NONE: "none",
+    CLASS_R1_ONLY: "r1_only",
+    CLASS_R2_ONLY: "r2_only",
+    CLASS_BOTH: "both",
+    CLASS_BLOCKED: "blocked",
+    CLASS_BLIND: "blind",
+    CLASS_NODATA: "nodata",
+}
+
+
+# --- Class Raster ---
+def dual_class_poses(r1_active, r2_active, radar_sep, r_max, blind_zone_m, scan_limit_deg):
+    """(class bit, pose) of the active radars, Radar 1 -> bit 1, Radar 2 -> bit 2."""
+    bits = [bit for bit, active in ((CLASS_R1_ONLY, r1_active), (CLASS_R2_ONLY, r2_active)) if active]
+    return list(zip(bits, dual_radar_layout(radar_sep, r_max, blind_zone_m, scan_limit_deg, r1_active, r2_active)))
+
+
+def classify_cells(poses, x, y):
+    """uint8 coverage class at points x, y (broadcast).
+
+    Covered cells are R1-only / R2-only / both; uncovered cells are blind
+    if inside a blind zone, else blocked if inside an occluded sector.
+    """
+    bits = np.array([b for b, _ in poses], dtype=np.uint8)
+    valid, blocked, blind = radar_region_masks([p for _, p in poses], x, y)
+    cls = np.bitwise_or.reduce(np.where(valid, bits[:, None, None], 0), axis=0).astype(np.uint8)
+    uncovered = cls == CLASS_NONE
+    cls[uncovered & np.any(blocked, axis=0)] = CLASS_BLOCKED
+    cls[uncovered & np.any(blind, axis=0)] = CLASS_BLIND
+    return cls
+
+
+# --- Tiled Memmap Export ---
+def export_dual_coverage_classes(path, r1_active, r2_active, radar_sep, r_max, blind_zone_m, scan_limit_deg,
+                                 grid_res, bounds=None, tile_size=1024):
+    """Writes the per-cell coverage class raster as uint8 tiles backed by np.memmap.
+
+    Produces path + ".bin" (tiles of tile_size x tile_size cells, stored as
+    a C-ordered [tile_row, tile_col, row, col] array, so every tile is one
+    contiguous block) and path + ".json" (origin, resolution, shape, tile
+    layout, class legend). Tiles are computed one at a time; tiles out of
+    reach of every radar are filled without evaluation. Row 0 is y_min.
+    Returns the header dict.
+    """
+    poses = dual_class_poses(r1_active, r2_active, radar_sep, r_max, blind_zone_m, scan_limit_deg)
+    if bounds is None:
+        margin = r_max + 5.0
+        bounds = (-margin, -margin, margin, radar_sep + margin)
+    x_min, y_min, x_max, y_max = (float(b) for b in bounds)
+    width = int(round((x_max - x_min) / grid_res))
+    height = int(round((y_max - y_min) / grid_res))
+    tiles_x = -(-width // tile_size)
+    tiles_y = -(-height // tile_size)
+
+    header = {
+        "format": "coverage_classes_tiled_v1",
+        "data_file": os.path.basename(path) + ".bin",
+        "dtype": "uint8",
+        "origin": [x_min, y_min],
+        "resolution": grid_res,
+        "width": width,
+        "height": height,
+        "tile_size": tile_size,
+        "tiles_x": tiles_x,
+        "tiles_y": tiles_y,
+        "layout": "tile_row, tile_col, row, col (C order); row 0 at y_min, col 0 at x_min",
+        "classes": {str(k): v for k, v in CLASS_NAMES.items()},
+        "radars": {"r1_active": bool(r1_active), "r2_active": bool(r2_active), "radar_sep": radar_sep,
+                   "r_max": r_max, "blind_zone_m": blind_zone_m, "scan_limit_deg": scan_limit_deg},
+    }
+
+    tiles = np.memmap(path + ".bin", dtype=np.uint8, mode="w+", shape=(tiles_y, tiles_x, tile_size, tile_size))
+    reach = r_max
+    for ty in range(tiles_y):
+        for tx in range(tiles_x):
+            x0 = x_min + tx * tile_size * grid_res
+            y0 = y_min + ty * tile_size * grid_res
+            x1 = x0 + tile_size * grid_res
+            y1 = y0 + tile_size * grid_res
+            tile = tiles[ty, tx]
+
+            # Nearest distance from each radar to the tile box
+            near = [np.hypot(max(x0 - p["x"], 0, p["x"] - x1), max(y0 - p["y"], 0, p["y"] - y1)) for _, p in poses]
+            if not poses or min(near) > reach:
+                tile[:] = CLASS_NONE
+            else:
+                xs = (x0 + grid_res / 2 + grid_res * np.arange(tile_size))[np.newaxis, :]
+                ys = (y0 + grid_res / 2 + grid_res * np.arange(tile_size))[:, np.newaxis]
+                tile[:] = classify_cells(poses, xs, ys)
+
+            # Padding past the raster edge
+            n_rows = min(tile_size, height - ty * tile_size)
+            n_cols = min(tile_size, width - tx * tile_size)
+            tile[n_rows:, :] = CLASS_NODATA
+            tile[:, n_cols:] = CLASS_NODATA
+        tiles.flush()
+    del tiles
+
+    with open(path + ".json", "w") as f:
+        json.dump(header, f, indent=2)
+    return header
+
+
+def open_coverage_raster(json_path):
+    """Reopens an export zero-copy: returns (header, read-only memmap of tiles)."""
+    with open(json_path) as f:
+        header = json.load(f)
+    data_path = os.path.join(os.path.dirname(json_path), header["data_file"])
+    tiles = np.memmap(data_path, dtype=header["dtype"], mode="r",
+                      shape=(header["tiles_y"], header["tiles_x"], header["tile_size"], header["tile_size"]))
+    return header, tiles
+
+
+def read_window(header, tiles, row0, row1, col0, col1):
+    """Copies cells [row0:row1, col0:col1] of the full raster out of the touched tiles only."""
+    ts = header["tile_size"]
+    out = np.empty((row1 - row0, col1 - col0), dtype=np.uint8)
+    for ty in range(row0 // ts, (row1 - 1) // ts + 1):
+        for tx in range(col0 // ts, (col1 - 1) // ts + 1):
+            r_lo, r_hi = max(row0, ty * ts), min(row1, (ty + 1) * ts)
+            c_lo, c_hi = max(col0, tx * ts), min(col1, (tx + 1) * ts)
+            out[r_lo - row0:r_hi - row0, c_lo - col0:c_hi - col0] = tiles[ty, tx, r_lo - ty * ts:r_hi - ty * ts,
+                                                                           c_lo - tx * ts:c_hi - tx * ts]
+    return out
+
+
+def class_areas(header, tiles):
+    """Area per class (m²), streamed tile by tile."""
+    counts = np.zeros(256, dtype=np.int64)
+    for ty in range(header["tiles_y"]):
+        for tx in range(header["tiles_x"]):
+            counts += np.bincount(tiles[ty, tx].ravel(), minlength=256)
+    cell_area = header["resolution"] ** 2
+    return {name: counts[k] * cell_area for k, name in CLASS_NAMES.items() if k != CLASS_NODATA}
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+    from coverage_engine import calculate_multi_coverage
+
+    print("--- Debugging Coverage Export ---")
+
+    out_dir = tempfile.mkdtemp()
+    path = os.path.join(out_dir, "passage")
+    header = export_dual_coverage_classes(path, True, True, 20.0, 22.5, 1.0, 60.0, 0.1, tile_size=256)
+    hdr, tiles = open_coverage_raster(path + ".json")
+    areas = class_areas(hdr, tiles)
+    ref = calculate_multi_coverage(dual_radar_layout(20.0, 22.5, 1.0, 60.0), 0.1,
+                                   bounds=tuple(hdr["origin"]) + (hdr["origin"][0] + hdr["width"] * 0.1,
+                                                                  hdr["origin"][1] + hdr["height"] * 0.1))
+    print(f"Raster {hdr['height']}x{hdr['width']} in {hdr['tiles_y']}x{hdr['tiles_x']} tiles")
+    print(f"Union {areas['r1_only'] + areas['r2_only'] + areas['both']:.2f} m² vs {ref['area_union']:.2f} m², "
+          f"both {areas['both']:.2f} vs {ref['area_k'][2]:.2f} m²")
+    print("Window around Radar 1:\n", read_window(hdr, tiles, 270, 290, 265, 286))
+
+    # Site scale: 1 km x 500 m at 5 cm -> 200 M cells
+    t0 = time.time()
+    big = os.path.join(out_dir, "site")
+    header = export_dual_coverage_classes(big, True, True, 20.0, 22.5, 1.0, 60.0, 0.05,
+                                          bounds=(-500.0, -250.0, 500.0, 250.0), tile_size=1024)
+    print(f"Site export {header['height']}x{header['width']} in {time.time() - t0:.1f} s, "
+          f"{os.path.getsize(big + '.bin') / 1e6:.0f} MB")
+    os.remove(big + ".bin")
@@ -0,0 +1,88 @@
+import math
+
+import numpy as np
+import plotly.graph_objects as go
+
+from coverage_export import (CLASS_NONE, CLASS_R1_ONLY, CLASS_R2_ONLY, CLASS_BOTH, CLASS_BLOCKED, CLASS_BLIND,
+                             classify_cells)
+
+# Same palette as the vector Passage Map layers
+CLASS_COLORS = {
+    CLASS_NONE: "rgba(0,0,0,0)",
+    CLASS_R1_ONLY: "rgba(0,0,255,0.3)",
+    CLASS_R2_ONLY: "rgba(255,0,0,0.3)",
+    CLASS_BOTH: "rgba(128,0,128,0.45)",
+    CLASS_BLOCKED: "rgba(128,128,128,0.4)",
+    CLASS_BLIND: "rgba(50,50,50,0.8)",
+}
+
+
+# --- Discrete Colormap ---
+def discrete_colorscale(colors):
+    """Plotly colorscale with one flat band per integer class 0..K-1 (use zmin=-0.5, zmax=K-0.5)."""
+    k = len(colors)
+    scale = []
+    for i in range(k):
+        scale.append([i / k, colors[i]])
+        scale.append([(i + 1) / k, colors[i]])
+    return scale
+
+
+# --- Level-of-Detail Raster ---
+def lod_grid(view_bounds, max_cells):
+    """Cell-center grid over view_bounds with the finest square cell keeping nx * ny <= max_cells."""
+    x_min, y_min, x_max, y_max = view_bounds
+    cell = math.sqrt((x_max - x_min) * (y_max - y_min) / max_cells)
+    nx = max(1, int(math.floor((x_max - x_min) / cell)))
+    ny = max(1, int(math.floor((y_max - y_min) / cell)))
+    x_grid = x_min + (np.arange(nx) + 0.5) * (x_max - x_min) / nx
+    y_grid = y_min + (np.arange(ny) + 0.5) * (y_max - y_min) / ny
+    return x_grid, y_grid
+
+
+def lod_class_raster(poses, view_bounds, max_cells=160_000):
+    """Coverage classes resampled for the current view.
+
+    The cell size follows the zoom (view extent / max_cells), so the raster
+    sent to the browser has a fixed upper size whatever the underlying
+    model resolution. Returns (x_grid, y_grid, uint8 classes).
+    """
+    x_grid, y_grid = lod_grid(view_bounds, max_cells)
+    classes = classify_cells(poses, x_grid[np.newaxis, :], y_grid[:, np.newaxis])
+    return x_grid, y_grid, classes
+
+
+def class_heatmap(x_grid, y_grid, classes, colors=CLASS_COLORS):
+    """Single Heatmap trace of a uint8 class raster with a discrete colormap.
+
+    z stays uint8, which plotly serializes as a base64 typed array, so the
+    figure JSON grows by ~1.33 bytes per cell.
+    """
+    palette = [colors[k] for k in sorted(colors)]
+    return go.Heatmap(
+        x=x_grid, y=y_grid, z=classes.astype(np.uint8),
+        zmin=-0.5, zmax=len(palette) - 0.5, colorscale=discrete_colorscale(palette),
+        showscale=False, hoverinfo="skip", zsmooth=False,
+    )
+
+
+if __name__ == "__main__":
+    import time
+    from coverage_export import dual_class_poses
+
+    print("--- Debugging Coverage Render ---")
+
+    poses = dual_class_poses(True, True, 20.0, 22.5, 1.0, 60.0)
+    full_view = (-27.5, -27.5, 27.5, 47.5)
+    for max_cells in (40_000, 160_000):
+        for zoom in (1, 4, 16):
+            cx, cy = 0.0, 0.0
+            half_w = (full_view[2] - full_view[0]) / 2 / zoom
+            half_h = (full_view[3] - full_view[1]) / 2 / zoom
+            view = (cx - half_w, cy - half_h, cx + half_w, cy + half_h)
+            t0 = time.time()
+            x, y, cls = lod_class_raster(poses, view, max_cells)
+            fig = go.Figure(class_heatmap(x, y, cls))
+            size = len(fig.to_json())
+            print(f"max_cells {max_cells:>7}, zoom {zoom:>2}x: cell {(x[1] - x[0]) * 100:.2f} cm, "
+                  f"{cls.size} cells, JSON {size / 1e3:.0f} kB, {(time.time() - t0) * 1e3:.0f} ms")
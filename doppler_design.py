@@ -0,0 +1,180 @@
+import itertools
+import numpy as np
+
+
+# --- Doppler Limits ---
+def calculate_velocity_limits(fc, t_chirp_cycle, n_loops, n_tx=1, c=3e8):
+    """Calculates max unambiguous velocity and velocity resolution.
+
+    With TDM-MIMO the same TX repeats every n_tx chirps, so the Doppler
+    sampling period is n_tx * t_chirp_cycle. Arguments broadcast.
+    """
+    fc, t_chirp_cycle, n_loops, n_tx = np.broadcast_arrays(
+        *[np.asarray(v, dtype=float) for v in (fc, t_chirp_cycle, n_loops, n_tx)]
+    )
+    wavelength = c / fc
+    t_doppler = n_tx * t_chirp_cycle
+
+    # v_max = lambda / (4 * Tc) -> measured velocities fold into [-v_max, v_max)
+    v_max = wavelength / (4 * t_doppler)
+    # v_res = lambda / (2 * N * Tc)
+    v_res = wavelength / (2 * n_loops * t_doppler)
+
+    return {
+        "wavelength": wavelength,
+        "t_doppler": t_doppler,
+        "v_max": v_max,
+        "v_res": v_res,
+    }
+
+
+def doppler_bins_to_velocity(bins, n_doppler, t_doppler, fc, c=3e8):
+    """Converts FFT Doppler bin indices (0..N-1, unshifted) to folded velocities."""
+    bins = np.asarray(bins, dtype=float)
+    n_doppler = np.asarray(n_doppler, dtype=float)
+    # Bins at or above N/2 are negative frequencies
+    signed = np.where(bins >= n_doppler / 2, bins - n_doppler, bins)
+    return signed * (c / fc) / (2 * n_doppler * t_doppler)
+
+
+def fold_velocity(v, v_max):
+    """Folds true velocities into the measured interval [-v_max, v_max)."""
+    span = 2 * v_max
+    return np.mod(np.asarray(v) + v_max, span) - v_max
+
+
+# --- Multi-PRF (CRT) Solver ---
+def calculate_crt_span(periods, fc, v_tol, k_max=256, c=3e8):
+    """Calculates the unambiguous velocity span of multi-PRF period sets.
+
+    periods has shape [..., n_prf]. Each PRF folds velocity with interval
+    V_i = lambda / (2 T_i); the combined ambiguity is the first multiple of
+    V_0 that is also a multiple of every other V_i within v_tol.
+    Returns the span (total, i.e. -span/2..span/2) for each set.
+    """
+    periods = np.asarray(periods, dtype=float)
+    wavelength = c / fc
+    fold = wavelength / (2 * periods)                       # [..., n]
+
+    k = np.arange(1, k_max + 1)
+    v_test = k * fold[..., :1]                              # [..., K]
+    ratio = v_test[..., :, None] / fold[..., None, 1:]      # [..., K, n-1]
+    resid = np.abs(ratio - np.round(ratio)) * fold[..., None, 1:]
+    coincide = np.all(resid <= v_tol, axis=-1)              # [..., K]
+
+    first = np.argmax(coincide, axis=-1)
+    span = np.take_along_axis(v_test, first[..., None], axis=-1)[..., 0]
+    # No coincidence found within k_max: report the searched span as a lower bound
+    found = np.any(coincide, axis=-1)
+    span = np.where(found, span, v_test[..., -1])
+    return span, found
+
+
+def solve_multi_prf(candidate_periods, fc, n_prf=2, v_tol=0.1, v_required=None, top_n=10, k_max=256, c=3e8,
+                    mem_budget_mb=32):
+    """Searches candidate chirp-period sets for the widest unambiguous velocity span.
+
+    All n_prf-combinations of candidate_periods are evaluated in vectorized
+    chunks sized so the [chunk, k_max, n_prf - 1] temporaries stay within
+    mem_budget_mb. Returns the best top_n sets sorted by span.
+    """
+    candidate_periods = np.asarray(candidate_periods, dtype=float)
+    combos = np.array(list(itertools.combinations(range(len(candidate_periods)), n_prf)))
+    if combos.size == 0:
+        return {"periods": np.empty((0, n_prf)), "span": np.empty(0), "v_max": np.empty(0), "found": np.empty(0, dtype=bool)}
+
+    periods = candidate_periods[combos]
+    span = np.empty(len(periods))
+    found = np.empty(len(periods), dtype=bool)
+    # ~4 live float64 temporaries of k_max * (n_prf - 1) per combination
+    chunk = max(1, int(mem_budget_mb * 2**20 // (4 * 8 * k_max * max(n_prf - 1, 1))))
+    for i0 in range(0, len(periods), chunk):
+        i1 = i0 + chunk
+        span[i0:i1], found[i0:i1] = calculate_crt_span(periods[i0:i1], fc, v_tol, k_max=k_max, c=c)
+
+    valid = np.ones(len(span), dtype=bool)
+    if v_required is not None:
+        valid = span / 2 >= v_required
+
+    order = np.lexsort((np.max(periods, axis=1), -span))
+    order = order[valid[order]][:top_n]
+
+    return {
+        "periods": periods[order],
+        "span": span[order],
+        "v_max": span[order] / 2,
+        "found": found[order],
+    }
+
+
+# --- Batch Doppler Unfolding ---
+def resolve_doppler_batch(v_measured, periods, fc, v_span, c=3e8):
+    """Unfolds multi-PRF velocity measurements in one vectorized pass.
+
+    v_measured has shape [M, n_prf] (folded velocity seen in each PRF).
+    Every unfolding of the first PRF inside +-v_span/2 is tested against
+    the other PRFs and the candidate with the smallest squared residual
+    wins. Returns (v_true [M], residual_rms [M]).
+    """
+    v_measured = np.atleast_2d(np.asarray(v_measured, dtype=float))
+    periods = np.asarray(periods, dtype=float)
+    wavelength = c / fc
+    fold = wavelength / (2 * periods)                       # [n]
+
+    # Candidate unfoldings of PRF 0: v0 + m * V0
+    m_max = int(np.ceil(v_span / (2 * fold[0])))
+    m = np.arange(-m_max, m_max + 1)
+    cand = v_measured[:, :1] + m[None, :] * fold[0]         # [M, C]
+    in_span = np.abs(cand) <= v_span / 2
+
+    # Wrapped distance between each candidate and the other PRF measurements
+    diff = cand[:, :, None] - v_measured[:, None, 1:]       # [M, C, n-1]
+    diff = np.mod(diff + fold[1:] / 2, fold[1:]) - fold[1:] / 2
+    cost = np.sum(diff ** 2, axis=-1)
+    cost = np.where(in_span, cost, np.inf)
+
+    best = np.argmin(cost, axis=1)
+    rows = np.arange(len(best))
+    v_true = cand[rows, best]
+    residual_rms = np.sqrt(cost[rows, best] / max(len(periods) - 1, 1))
+    return v_true, residual_rms
+
+
+def resolve_doppler_bins(bins, n_doppler, periods, fc, v_span, c=3e8):
+    """Unfolds detected Doppler bins [M, n_prf] from each PRF's FFT."""
+    bins = np.atleast_2d(np.asarray(bins))
+    periods = np.asarray(periods, dtype=float)
+    v_measured = doppler_bins_to_velocity(bins, n_doppler, periods[None, :], fc, c=c)
+    return resolve_doppler_batch(v_measured, periods, fc, v_span, c=c)
+
+
+if __name__ == "__main__":
+    print("--- Debugging Doppler Design ---")
+
+    fc = 77e9
+    lim = calculate_velocity_limits(fc, 37e-6, 128, n_tx=3)
+    print(f"v_max: {float(lim['v_max']):.2f} m/s, v_res: {float(lim['v_res'])*100:.2f} cm/s")
+
+    # Candidate periods: 3 TX x (idle 5..40 us + 27 us ramp)
+    cands = 3 * (np.arange(5e-6, 40e-6, 1e-6) + 27e-6)
+    best = solve_multi_prf(cands, fc, n_prf=2, v_tol=0.05, top_n=3)
+    for p, s in zip(best["periods"], best["span"]):
+        print(f"T = {p*1e6} us -> +-{s/2:.2f} m/s")
+
+    # Batch unfold 10k random targets
+    periods = best["periods"][0]
+    v_true = np.random.uniform(-best["v_max"][0] * 0.95, best["v_max"][0] * 0.95, 10000)
+    v_meas = np.stack([fold_velocity(v_true, (3e8 / fc) / (4 * t)) for t in periods], axis=1)
+    v_est, _ = resolve_doppler_batch(v_meas, periods, fc, best["span"][0])
+    print(f"Unfold success: {np.mean(np.abs(v_est - v_true) < 1e-6)*100:.1f}%")
+
+    # Three PRFs from 80 candidates (82,160 sets) under the chunk budget
+    import time
+    import tracemalloc
+    cands = 3 * (np.linspace(5e-6, 40e-6, 80) + 27e-6)
+    tracemalloc.start()
+    t0 = time.time()
+    best = solve_multi_prf(cands, fc, n_prf=3, v_tol=0.05, top_n=1)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"3 PRFs of 80: +-{best['v_max'][0]:.2f} m/s in {time.time() - t0:.2f} s, peak {peak / 2**20:.0f} MB")
@@ -1,4 +1,5 @@
 import math
+import numpy as np
 
 # --- FMCW Radar Helper Functions ---
 def calculate_range_fft(slope_hz_s, fs, n_fft, c=3e8):
@@ -74,6 +75,79 @@ def calculate_radar_range_fmcw(pt, gt, gr, fc, sigma, l_loss, nf_lin, t0, b_if,
     
     return r_max, pn, g_proc
 
+# --- Vectorized (Broadcast) Versions ---
+# Same formulas as the scalar helpers above, evaluated on NumPy arrays.
+# Every argument broadcasts; results are structured arrays of the broadcast shape.
+# Operation order matches the scalar code, so results agree to the last bit
+# (NumPy's SIMD pow on arrays can differ from libm pow by 1 ulp).
+
+RANGE_FFT_DTYPE = np.dtype([("range_per_bin", "f8")])
+MAX_RANGE_DTYPE = np.dtype([("slope", "f8"), ("r_max_adc", "f8"), ("r_max_if", "f8"),
+                            ("r_max_timing", "f8"), ("r_max_unamb", "f8")])
+RADAR_RANGE_CW_DTYPE = np.dtype([("r_max", "f8")])
+RADAR_RANGE_FMCW_DTYPE = np.dtype([("r_max", "f8"), ("pn", "f8"), ("g_proc", "f8")])
+
+def _broadcast_f8(*args):
+    return np.broadcast_arrays(*[np.asarray(a, dtype=np.float64) for a in args])
+
+def calculate_range_fft_vec(slope_hz_s, fs, n_fft, c=3e8):
+    """Vectorized calculate_range_fft."""
+    slope_hz_s, fs, n_fft, c = _broadcast_f8(slope_hz_s, fs, n_fft, c)
+    bin_bw = fs / n_fft
+    out = np.empty(bin_bw.shape, dtype=RANGE_FFT_DTYPE)
+    out["range_per_bin"] = (c * bin_bw) / (2 * slope_hz_s)
+    return out
+
+def calculate_max_range_vec(fs, t_chirp, b_bw, f_if_max=None, c=3e8):
+    """Vectorized calculate_max_range. f_if_max of None, 0 or NaN means no IF limit."""
+    if f_if_max is None:
+        f_if_max = 0.0
+    fs, t_chirp, b_bw, f_if_max, c = _broadcast_f8(fs, t_chirp, b_bw, f_if_max, c)
+    slope = b_bw / t_chirp
+
+    out = np.empty(slope.shape, dtype=MAX_RANGE_DTYPE)
+    out["slope"] = slope
+    out["r_max_adc"] = (c * fs) / (4 * slope)
+
+    has_if = np.nan_to_num(f_if_max) != 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out["r_max_if"] = np.where(has_if, (c * f_if_max) / (2 * slope), np.inf)
+
+    out["r_max_timing"] = (c * t_chirp) / 2
+    out["r_max_unamb"] = np.minimum(np.minimum(out["r_max_adc"], out["r_max_if"]), out["r_max_timing"])
+    return out
+
+def calculate_radar_range_cw_vec(pt, gt, gr, fc, sigma, l_loss, p_min, c=3e8):
+    """Vectorized calculate_radar_range_cw."""
+    pt, gt, gr, fc, sigma, l_loss, p_min, c = _broadcast_f8(pt, gt, gr, fc, sigma, l_loss, p_min, c)
+    wavelength = c / fc
+    numerator = pt * gt * gr * (wavelength ** 2) * sigma
+    denominator = ((4 * math.pi) ** 3) * l_loss * p_min
+
+    out = np.empty(numerator.shape, dtype=RADAR_RANGE_CW_DTYPE)
+    out["r_max"] = (numerator / denominator) ** 0.25
+    return out
+
+def calculate_radar_range_fmcw_vec(pt, gt, gr, fc, sigma, l_loss, nf_lin, t0, b_if, snr_min_lin, n_range, n_doppler, c=3e8):
+    """Vectorized calculate_radar_range_fmcw."""
+    pt, gt, gr, fc, sigma, l_loss, nf_lin, t0, b_if, snr_min_lin, n_range, n_doppler, c = _broadcast_f8(
+        pt, gt, gr, fc, sigma, l_loss, nf_lin, t0, b_if, snr_min_lin, n_range, n_doppler, c
+    )
+    wavelength = c / fc
+    k_boltz = 1.38064852e-23
+
+    pn = k_boltz * t0 * nf_lin * b_if
+    g_proc = n_range * n_doppler
+
+    numerator = pt * gt * gr * (wavelength ** 2) * sigma * g_proc
+    denominator = ((4 * math.pi) ** 3) * l_loss * pn * snr_min_lin
+
+    out = np.empty(numerator.shape, dtype=RADAR_RANGE_FMCW_DTYPE)
+    out["r_max"] = (numerator / denominator) ** 0.25
+    out["pn"] = pn
+    out["g_proc"] = g_proc
+    return out
+
 if __name__ == "__main__":
     print("--- Debugging FMCW Radar Logic ---")
     
@@ -136,3 +210,13 @@ if __name__ == "__main__":
     
     print(f"R_max CW: {r_cw:.2f} m")
     print(f"R_max FMCW: {r_fmcw:.2f} m (Gain: {10*math.log10(g_proc):.2f} dB)")
+    
+    # 5. Vectorized Sweep (Pt x NF x Range Gates)
+    print("\n5. Vectorized Sweep")
+    pt_sweep = 10**((np.linspace(0, 20, 100)[:, None, None] - 30) / 10)
+    nf_sweep = 10**(np.linspace(5, 20, 100)[None, :, None] / 10)
+    n_range_sweep = np.arange(1, 101)[None, None, :] * 16
+    sweep = calculate_radar_range_fmcw_vec(pt_sweep, gt, gr, fc, sigma, loss, nf_sweep, t0, b_if, snr_min, n_range_sweep, n_doppler)
+    print(f"Combinations: {sweep.size}, R_max span: {sweep['r_max'].min():.2f} .. {sweep['r_max'].max():.2f} m")
+    r_vec = calculate_radar_range_fmcw_vec(pt, gt, gr, fc, sigma, loss, nf, t0, b_if, snr_min, n_range, n_doppler)
+    print(f"Scalar == Vectorized: {r_vec['r_max'] == r_fmcw}")
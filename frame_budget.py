@@ -0,0 +1,112 @@
+import numpy as np
+
+# --- AWR2243 Frame / Interface Constants ---
+AWR2243_NUM_RX = 4
+AWR2243_NUM_TX = 3
+
+# Per-lane rate and max lane count of the raw ADC data interfaces
+INTERFACE_LIMITS = {
+    "LVDS": {"lanes": 4, "lane_rate": 600e6},   # bit/s per lane
+    "CSI-2": {"lanes": 4, "lane_rate": 600e6},  # bit/s per lane
+}
+
+# ADC values per sample for each sampling mode (I/Q = 2, real = 1)
+SAMPLE_COMPONENTS = {"complex_1x": 2, "complex_2x": 2, "real": 1}
+
+
+# --- Frame Timing & Data Rate Helper ---
+def calculate_frame_budget(n_samples, fs, idle_time, adc_start_time, ramp_end_time,
+                           n_loops, n_tx, frame_period, n_rx=AWR2243_NUM_RX,
+                           sampling_mode="real", bits_per_sample=16,
+                           interface="LVDS", n_lanes=None):
+    """Calculates frame timing, data rates and interface load.
+
+    Every numeric argument may be a scalar or a NumPy array; arrays are
+    broadcast against each other so a whole sweep of frame configurations
+    is evaluated in one call. Times are in seconds, rates in bit/s.
+    """
+    n_samples, fs, idle_time, adc_start_time, ramp_end_time, n_loops, n_tx, frame_period, n_rx, bits_per_sample = np.broadcast_arrays(
+        *[np.asarray(v, dtype=float) for v in (n_samples, fs, idle_time, adc_start_time, ramp_end_time,
+                                              n_loops, n_tx, frame_period, n_rx, bits_per_sample)]
+    )
+
+    limits = INTERFACE_LIMITS[interface]
+    if n_lanes is None:
+        n_lanes = limits["lanes"]
+    components = SAMPLE_COMPONENTS[sampling_mode]
+
+    # 1. Chirp Timing
+    # ADC window = N / Fs, must fit inside the ramp after the ADC start time
+    t_adc = n_samples / fs
+    t_chirp_cycle = idle_time + ramp_end_time
+    ramp_ok = (adc_start_time + t_adc) <= ramp_end_time
+
+    # 2. Frame Timing
+    # Chirps per frame = loops * TX (TDM-MIMO: one chirp per TX per loop)
+    chirps_per_frame = n_loops * n_tx
+    t_frame_active = chirps_per_frame * t_chirp_cycle
+    frame_ok = t_frame_active <= frame_period
+    with np.errstate(divide='ignore', invalid='ignore'):
+        duty_cycle = t_frame_active / frame_period
+        frame_rate = 1.0 / frame_period
+
+    # 3. Data Volume
+    bits_per_chirp_rx = n_samples * components * bits_per_sample
+    bits_per_frame_rx = bits_per_chirp_rx * chirps_per_frame
+    bits_per_frame = bits_per_frame_rx * n_rx
+
+    # 4. Data Rates
+    # Burst rate while the ADC is sampling, per RX
+    rate_adc_rx = fs * components * bits_per_sample
+    # Sustained rate during the active part of the frame (chirp data drained every chirp cycle)
+    rate_active_rx = bits_per_chirp_rx / t_chirp_cycle
+    rate_active_total = rate_active_rx * n_rx
+    # Long-term average over the whole frame period
+    rate_avg_rx = bits_per_frame_rx * frame_rate
+    rate_avg_total = rate_avg_rx * n_rx
+
+    # 5. Interface Budget
+    interface_capacity = n_lanes * limits["lane_rate"]
+    interface_util = rate_active_total / interface_capacity
+    interface_ok = interface_util <= 1.0
+
+    # 6. Storage
+    storage_per_hour = rate_avg_total * 3600.0 / 8.0  # bytes
+
+    return {
+        "t_adc": t_adc,
+        "t_chirp_cycle": t_chirp_cycle,
+        "chirps_per_frame": chirps_per_frame,
+        "t_frame_active": t_frame_active,
+        "duty_cycle": duty_cycle,
+        "frame_rate": frame_rate,
+        "bits_per_frame": bits_per_frame,
+        "rate_adc_rx": rate_adc_rx,
+        "rate_active_rx": rate_active_rx,
+        "rate_active_total": rate_active_total,
+        "rate_avg_rx": rate_avg_rx,
+        "rate_avg_total": rate_avg_total,
+        "interface_capacity": interface_capacity,
+        "interface_util": interface_util,
+        "storage_per_hour": storage_per_hour,
+        "ramp_ok": ramp_ok,
+        "frame_ok": frame_ok,
+        "interface_ok": interface_ok,
+    }
+
+
+if __name__ == "__main__":
+    print("--- Debugging Frame Budget ---")
+
+    # Single configuration (Chirp Designer defaults)
+    fb = calculate_frame_budget(450, 22.5e6, 10e-6, 6e-6, 27e-6, 128, 3, 50e-3)
+    print(f"T_cycle: {float(fb['t_chirp_cycle'])*1e6:.1f} us, Active: {float(fb['t_frame_active'])*1e3:.2f} ms")
+    print(f"Active Rate: {float(fb['rate_active_total'])/1e6:.1f} Mbps ({float(fb['interface_util'])*100:.1f}% of LVDS)")
+    print(f"Storage: {float(fb['storage_per_hour'])/1e9:.1f} GB/h")
+
+    # Sweep: loops x frame period
+    loops = np.array([32, 64, 128, 256])[:, None]
+    periods = np.array([20e-3, 33e-3, 50e-3, 100e-3])[None, :]
+    sweep = calculate_frame_budget(450, 22.5e6, 10e-6, 6e-6, 27e-6, loops, 3, periods)
+    print("Frame fits (loops x period):")
+    print(sweep["frame_ok"])
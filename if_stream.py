@@ -0,0 +1,148 @@
+import wave
+import numpy as np
+
+# Largest data chunk a RIFF/WAV header can describe
+WAV_MAX_BYTES = 0xFFFFFFFF - 36
+
+
+# --- Target Scenario ---
+def scenario_target(range_m, velocity=0.0, amplitude=1.0, t_start=0.0, t_end=np.inf):
+    """One scripted point target: R(t) = range_m + velocity * (t - t_start) while t_start <= t < t_end."""
+    return {
+        "range": range_m,
+        "velocity": velocity,
+        "amplitude": amplitude,
+        "t_start": t_start,
+        "t_end": t_end,
+    }
+
+
+# --- Streaming IF Generator ---
+def generate_if_chunks(targets, fs, slope, f0, ramp_end_time, idle_time, duration,
+                       n_chirps=None, frame_period=None, sampling_mode="real",
+                       noise_std=0.0, chunk_size=1 << 18, seed=None, c=3e8):
+    """Yields the FMCW IF waveform of a target scenario chunk by chunk.
+
+    The stream is continuous in time: sample n is at t = n / fs. During the
+    ramp each target contributes A * exp(j*2*pi*(f0*tau + S*tau*u)) with
+    tau = 2R(t)/c and u the time since ramp start; idle time (and the rest of
+    the frame after n_chirps chirps) is silent. Real mode yields float32,
+    complex modes yield complex64. Memory is bounded by chunk_size.
+    """
+    n_total = int(round(duration * fs))
+    t_cycle = idle_time + ramp_end_time
+    if frame_period is None or n_chirps is None:
+        frame_period = np.inf
+        n_chirps = np.inf
+    is_complex = sampling_mode != "real"
+    rng = np.random.default_rng(seed)
+
+    for n0 in range(0, n_total, chunk_size):
+        n = np.arange(n0, min(n0 + chunk_size, n_total))
+        t = n / fs
+
+        # Position inside frame and chirp
+        t_frame = np.mod(t, frame_period) if np.isfinite(frame_period) else t
+        chirp_idx = np.floor(t_frame / t_cycle)
+        u = t_frame - chirp_idx * t_cycle
+        on_air = (u < ramp_end_time) & (chirp_idx < n_chirps)
+
+        sig = np.zeros(len(n), dtype=np.complex128 if is_complex else np.float64)
+        for tgt in targets:
+            alive = on_air & (t >= tgt["t_start"]) & (t < tgt["t_end"])
+            r = tgt["range"] + tgt["velocity"] * (t - tgt["t_start"])
+            tau = 2 * r / c
+            phase = 2 * np.pi * (f0 * tau + slope * tau * u)
+            if is_complex:
+                sig += np.where(alive, tgt["amplitude"] * np.exp(1j * phase), 0)
+            else:
+                sig += np.where(alive, tgt["amplitude"] * np.cos(phase), 0)
+
+        if noise_std > 0:
+            if is_complex:
+                sig += (noise_std / np.sqrt(2)) * (rng.standard_normal(len(n)) + 1j * rng.standard_normal(len(n)))
+            else:
+                sig += noise_std * rng.standard_normal(len(n))
+
+        yield sig.astype(np.complex64 if is_complex else np.float32)
+
+
+# --- Writers ---
+def _to_channels(chunk):
+    """Real chunk -> [n, 1]; complex chunk -> interleaved I/Q [n, 2]."""
+    if np.iscomplexobj(chunk):
+        return np.stack([chunk.real, chunk.imag], axis=1)
+    return chunk[:, None]
+
+
+def write_if_stream(path, chunks, fmt="int16", fs=None, full_scale=1.0):
+    """Writes IF chunks to disk without holding more than one chunk in memory.
+
+    fmt: "int16" or "float32" raw binary (I/Q interleaved for complex), or
+    "wav" (16-bit PCM, 2 channels for I/Q, requires fs). Values are scaled
+    so that +-full_scale maps to the int16 range. Returns samples written.
+    """
+    n_written = 0
+    scale = 32767.0 / full_scale
+
+    if fmt == "wav":
+        if fs is None:
+            raise ValueError("fs is required for WAV output")
+        wav = None
+        try:
+            for chunk in chunks:
+                ch = _to_channels(chunk)
+                if wav is None:
+                    wav = wave.open(path, "wb")
+                    wav.setnchannels(ch.shape[1])
+                    wav.setsampwidth(2)
+                    wav.setframerate(int(round(fs)))
+                if (n_written + len(ch)) * ch.shape[1] * 2 > WAV_MAX_BYTES:
+                    raise ValueError("WAV output exceeds 4 GB; use int16 or float32 raw output")
+                pcm = np.clip(np.round(ch * scale), -32768, 32767).astype("<i2")
+                wav.writeframes(pcm.tobytes())
+                n_written += len(ch)
+        finally:
+            if wav is not None:
+                wav.close()
+        return n_written
+
+    if fmt not in ("int16", "float32"):
+        raise ValueError(f"Unknown output format: {fmt}")
+
+    with open(path, "wb") as f:
+        for chunk in chunks:
+            ch = _to_channels(chunk)
+            if fmt == "int16":
+                out = np.clip(np.round(ch * scale), -32768, 32767).astype("<i2")
+            else:
+                out = ch.astype("<f4")
+            f.write(out.tobytes())
+            n_written += len(ch)
+    return n_written
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    print("--- Debugging IF Stream ---")
+
+    fs = 22.5e6
+    slope = 150e12
+    targets = [
+        scenario_target(5.0, velocity=1.5, amplitude=0.4),
+        scenario_target(12.0, velocity=-0.5, amplitude=0.2, t_start=0.002),
+    ]
+    stream = generate_if_chunks(targets, fs, slope, 77e9, 27e-6, 10e-6, 0.01,
+                                n_chirps=128, frame_period=5e-3, noise_std=0.01, chunk_size=1 << 16, seed=0)
+
+    path = os.path.join(tempfile.gettempdir(), "if_stream_debug.wav")
+    n = write_if_stream(path, stream, fmt="wav", fs=fs)
+    print(f"Wrote {n} samples ({n/fs*1e3:.1f} ms) to {path} ({os.path.getsize(path)/1e6:.2f} MB)")
+
+    # Beat frequency check on the first chirp of a fresh stream
+    first = next(generate_if_chunks(targets[:1], fs, slope, 77e9, 27e-6, 10e-6, 27e-6))
+    spec = np.abs(np.fft.rfft(first))
+    fb = np.argmax(spec) * fs / len(first)
+    print(f"Beat: {fb/1e6:.2f} MHz (expected {2*slope*5.0/3e8/1e6:.2f} MHz)")
@@ -0,0 +1,171 @@
+import numpy as np
+
+
+# --- Chirp / Frame Timing Config ---
+def chirp_config(f0, slope, idle_time, ramp_end_time, adc_start_time, t_adc, n_chirps, frame_period, if_max):
+    """Bundles one radar's chirp and frame timing (SI units).
+
+    Any value except n_chirps may be a NumPy array; arrays broadcast
+    against each other and against the start-time offsets in
+    analyze_interference.
+    """
+    return {
+        "f0": f0,
+        "slope": slope,
+        "idle_time": idle_time,
+        "ramp_end_time": ramp_end_time,
+        "adc_start_time": adc_start_time,
+        "t_adc": t_adc,
+        "n_chirps": n_chirps,
+        "frame_period": frame_period,
+        "if_max": if_max,
+    }
+
+
+def _in_band_time(d0, b, length, if_max):
+    """Time within [0, length] where |d0 + b*u| <= if_max (all arrays)."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        u1 = (-if_max - d0) / b
+        u2 = (if_max - d0) / b
+    lo = np.maximum(np.minimum(u1, u2), 0.0)
+    hi = np.minimum(np.maximum(u1, u2), length)
+    swept = np.maximum(hi - lo, 0.0)
+    # Equal slopes: constant beat frequency, in band for the whole overlap or not at all
+    constant = np.where(np.abs(d0) <= if_max, length, 0.0)
+    return np.where(b == 0, constant, np.nan_to_num(swept))
+
+
+# --- Interference Analyzer ---
+def analyze_interference(victim, aggressor, t_offset, radar_sep, n_frames=1, c=3e8):
+    """Calculates time-frequency overlap of an aggressor's chirps in a victim's ADC windows.
+
+    The aggressor frame starts t_offset seconds after the victim frame and
+    its signal arrives radar_sep / c later. Within each victim ADC window
+    the beat between the victim ramp and the received aggressor ramp is
+    linear in time; the part of it inside the victim IF band is counted as
+    interference. Equal slopes give a constant beat, i.e. a ghost target.
+
+    t_offset and all config values broadcast; results have the broadcast
+    shape (one entry per configuration).
+    """
+    n_v = int(victim["n_chirps"])
+    t_offset = np.asarray(t_offset, dtype=float)
+    keys = ("f0", "slope", "idle_time", "ramp_end_time", "adc_start_time", "t_adc", "frame_period", "if_max")
+    params = np.broadcast_arrays(
+        t_offset,
+        np.asarray(aggressor["n_chirps"], dtype=float),
+        *[np.asarray(victim[k], dtype=float) for k in keys],
+        *[np.asarray(aggressor[k], dtype=float) for k in keys],
+    )
+    t_off, n_a = params[0], params[1]
+    v = dict(zip(keys, params[2:10]))
+    a = dict(zip(keys, params[10:18]))
+    shape = t_off.shape
+    tau = radar_sep / c
+
+    # Broadcast layout: [config..., victim chirp, aggressor frame (2), aggressor chirp (K)]
+    def cfg(x):
+        return x[..., None, None, None]
+
+    # 1. Victim ADC windows
+    i = np.arange(n_frames * n_v)
+    t_cycle_v = v["idle_time"] + v["ramp_end_time"]
+    t_v = (i // n_v) * cfg(v["frame_period"])[..., 0, 0] + (i % n_v) * cfg(t_cycle_v)[..., 0, 0]
+    ws = t_v + cfg(v["adc_start_time"])[..., 0, 0]          # [..., I]
+    we = ws + cfg(v["t_adc"])[..., 0, 0]
+
+    # 2. Candidate aggressor chirps (received ramp must overlap the window)
+    t_cycle_a = a["idle_time"] + a["ramp_end_time"]
+    ramp_a = a["ramp_end_time"]
+    span = np.max(v["t_adc"] + ramp_a)
+    k_cand = int(np.ceil(span / np.min(t_cycle_a))) + 1
+
+    earliest = ws - tau - cfg(ramp_a)[..., 0, 0] - cfg(t_off)[..., 0, 0]
+    k_frame = np.floor(earliest / cfg(a["frame_period"])[..., 0, 0])
+    frame = k_frame[..., None] + np.arange(2)                # [..., I, 2]
+    frame_start = cfg(t_off)[..., 0] + frame * cfg(a["frame_period"])[..., 0]
+    m_lo = np.ceil((earliest[..., None] - frame * cfg(a["frame_period"])[..., 0]) / cfg(t_cycle_a)[..., 0])
+    m_hi = np.floor((we[..., None] - tau - frame_start) / cfg(t_cycle_a)[..., 0])
+    m = np.maximum(m_lo, 0)[..., None] + np.arange(k_cand)   # [..., I, 2, K]
+    valid = (m <= m_hi[..., None]) & (m < cfg(n_a))
+
+    t_a = frame_start[..., None] + m * cfg(t_cycle_a) + tau  # received ramp start
+
+    # 3. Overlap interval of ADC window and received ramp
+    lo = np.maximum(ws[..., None, None], t_a)
+    hi = np.minimum(we[..., None, None], t_a + cfg(ramp_a))
+    length = np.where(valid, np.maximum(hi - lo, 0.0), 0.0)
+
+    # 4. Beat frequency at the start of the overlap, and its slope
+    f_v = cfg(v["f0"]) + cfg(v["slope"]) * (lo - t_v[..., None, None])
+    f_a = cfg(a["f0"]) + cfg(a["slope"]) * (lo - t_a)
+    d0 = f_v - f_a
+    b = cfg(v["slope"]) - cfg(a["slope"])
+    b = np.broadcast_to(b, d0.shape)
+
+    t_hit = _in_band_time(d0, b, length, cfg(v["if_max"]))
+    ghost = (b == 0) & (t_hit > 0)
+
+    # 5. Summaries per configuration
+    t_hit_chirp = np.sum(t_hit, axis=(-2, -1))               # [..., I]
+    overlap_time = np.sum(t_hit_chirp, axis=-1)
+    adc_time = n_frames * n_v * v["t_adc"]
+    chirps_hit = np.sum(t_hit_chirp > 0, axis=-1)
+
+    ghost_beat_min = np.min(np.where(ghost, np.abs(d0), np.inf), axis=(-3, -2, -1))
+    ghost_beat_max = np.max(np.where(ghost, np.abs(d0), -np.inf), axis=(-3, -2, -1))
+    has_ghost = np.any(ghost, axis=(-3, -2, -1))
+    ghost_beat_min = np.where(has_ghost, ghost_beat_min, np.nan)
+    ghost_beat_max = np.where(has_ghost, ghost_beat_max, np.nan)
+
+    return {
+        "overlap_time": overlap_time.reshape(shape),
+        "overlap_fraction": (overlap_time / adc_time).reshape(shape),
+        "chirps_hit": chirps_hit.reshape(shape),
+        "chirp_hit_fraction": (chirps_hit / (n_frames * n_v)).reshape(shape),
+        "ghost_chirps": np.sum(np.any(ghost, axis=(-2, -1)), axis=-1).reshape(shape),
+        "ghost_beat_min": ghost_beat_min.reshape(shape),
+        "ghost_beat_max": ghost_beat_max.reshape(shape),
+        "ghost_range_min": (c * ghost_beat_min / (2 * v["slope"])).reshape(shape),
+        "ghost_range_max": (c * ghost_beat_max / (2 * v["slope"])).reshape(shape),
+    }
+
+
+def search_interference_free(radar_a, radar_b, t_offset, radar_sep, n_frames=1, c=3e8):
+    """Evaluates both interference directions for every offset / config combination.
+
+    radar_b starts t_offset after radar_a. Returns the per-direction results
+    plus the combined overlap fraction and a mask of interference-free
+    configurations.
+    """
+    t_offset = np.asarray(t_offset, dtype=float)
+    a_victim = analyze_interference(radar_a, radar_b, t_offset, radar_sep, n_frames=n_frames, c=c)
+    b_victim = analyze_interference(radar_b, radar_a, -t_offset, radar_sep, n_frames=n_frames, c=c)
+
+    total = a_victim["overlap_fraction"] + b_victim["overlap_fraction"]
+    return {
+        "a_victim": a_victim,
+        "b_victim": b_victim,
+        "overlap_fraction": total,
+        "interference_free": total == 0,
+        "best_index": np.unravel_index(np.argmin(total), total.shape),
+    }
+
+
+if __name__ == "__main__":
+    print("--- Debugging Radar Interference ---")
+
+    # Two identical AWR2243 radars, 10 m apart, facing each other
+    r1 = chirp_config(77e9, 150e12, 10e-6, 27e-6, 6e-6, 20e-6, 384, 50e-3, 10.125e6)
+    r2 = dict(r1)
+
+    # Sweep: start offset x aggressor slope
+    offsets = np.linspace(0, 100e-6, 201)[None, :]
+    r2["slope"] = np.array([100e12, 140e12, 150e12])[:, None]
+    res = search_interference_free(r1, r2, offsets, 10.0)
+    print(f"Configs: {res['overlap_fraction'].size}, interference-free: {np.sum(res['interference_free'])}")
+    best = res["best_index"]
+    print(f"Best: slope {float(r2['slope'][best[0], 0])/1e12:.0f} MHz/us, offset {float(offsets[0, best[1]])*1e6:.1f} us, "
+          f"overlap {res['overlap_fraction'][best]*100:.2f}%")
+    same = res["a_victim"]
+    print(f"Equal slopes @ 0 us: ghost chirps {same['ghost_chirps'][2, 0]}, ghost range {same['ghost_range_min'][2, 0]:.2f} m")
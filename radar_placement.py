@@ -0,0 +1,206 @@
+import math
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+
+from coverage_engine import radar_pose, calculate_multi_coverage
+
+
+# --- Arena Polygon Helpers ---
+def point_in_polygon(x, y, polygon):
+    """Even-odd ray casting test, vectorized over broadcast x / y arrays."""
+    x = np.asarray(x)
+    y = np.asarray(y)
+    inside = np.zeros(np.broadcast(x, y).shape, dtype=bool)
+    n = len(polygon)
+    for i in range(n):
+        x1, y1 = polygon[i]
+        x2, y2 = polygon[(i + 1) % n]
+        if y1 == y2:
+            continue
+        crosses = (y1 > y) != (y2 > y)
+        x_cross = x1 + (y - y1) * (x2 - x1) / (y2 - y1)
+        inside ^= crosses & (x < x_cross)
+    return inside
+
+
+def _polygon_bounds(polygon):
+    xs, ys = zip(*polygon)
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+@lru_cache(maxsize=8)
+def _arena_mask(polygon, grid_res):
+    """Cell-center mask of the arena polygon on the coverage raster."""
+    x_min, y_min, x_max, y_max = _polygon_bounds(polygon)
+    x_grid = x_min + grid_res / 2 + grid_res * np.arange(int(round((x_max - x_min) / grid_res)))
+    y_grid = y_min + grid_res / 2 + grid_res * np.arange(int(round((y_max - y_min) / grid_res)))
+    return point_in_polygon(x_grid[np.newaxis, :], y_grid[:, np.newaxis], polygon)
+
+
+def perimeter_slots(polygon, spacing):
+    """Candidate mounting points along the polygon edges, facing inward.
+
+    Returns arrays (x, y, inward_deg). The polygon may be given in either
+    winding order.
+    """
+    pts = np.asarray(polygon, dtype=float)
+    # Signed area > 0 -> counter-clockwise -> inward normal is the left normal
+    signed_area = 0.5 * np.sum(pts[:, 0] * np.roll(pts[:, 1], -1) - np.roll(pts[:, 0], -1) * pts[:, 1])
+    xs, ys, angs = [], [], []
+    for i in range(len(pts)):
+        p1, p2 = pts[i], pts[(i + 1) % len(pts)]
+        edge = p2 - p1
+        length = math.hypot(*edge)
+        if length == 0:
+            continue
+        n_slots = max(1, int(length // spacing))
+        t = (np.arange(n_slots) + 0.5) / n_slots
+        xs.append(p1[0] + t * edge[0])
+        ys.append(p1[1] + t * edge[1])
+        edge_deg = math.degrees(math.atan2(edge[1], edge[0]))
+        angs.append(np.full(n_slots, edge_deg + (90.0 if signed_area > 0 else -90.0)))
+    return np.concatenate(xs), np.concatenate(ys), np.concatenate(angs)
+
+
+# --- Layout Evaluation ---
+def evaluate_layout(radars, polygon, grid_res=0.25, k=1):
+    """Coverage stats of one layout, counted only inside the arena polygon."""
+    polygon = tuple(map(tuple, polygon))
+    mask = _arena_mask(polygon, grid_res)
+    res = calculate_multi_coverage(radars, grid_res, bounds=_polygon_bounds(polygon), return_raster=True)
+    count = res["coverage_count"][mask]
+
+    cell_area = grid_res * grid_res
+    arena_area = mask.sum() * cell_area
+    hist = np.bincount(count, minlength=len(radars) + 1)
+    area_k = np.cumsum(hist[::-1])[::-1] * cell_area
+    return {
+        "score": area_k[k] if k < len(area_k) else 0.0,
+        "area_union": area_k[1] if len(area_k) > 1 else 0.0,
+        "area_k": area_k,
+        "coverage_fraction": area_k[1] / arena_area if arena_area > 0 and len(area_k) > 1 else 0.0,
+        "arena_area": arena_area,
+    }
+
+
+def _evaluate_job(job):
+    """Process-pool worker: (radars, polygon, grid_res, k) -> stats."""
+    return evaluate_layout(*job)
+
+
+# --- Optimizer ---
+def _layout_radars(genome, slots, scan_limit_deg, r_max, blind_zone_m, orientation_offsets):
+    xs, ys, angs = slots
+    return [radar_pose(float(xs[s]), float(ys[s]), float(angs[s] + orientation_offsets[o]), scan_limit_deg, r_max, blind_zone_m)
+            for s, o in genome]
+
+
+def _separation_ok(genome, slots, min_separation):
+    xs, ys, _ = slots
+    idx = [s for s, _ in genome]
+    if len(set(idx)) < len(idx):
+        return False
+    px, py = xs[idx], ys[idx]
+    d2 = (px[:, None] - px[None, :]) ** 2 + (py[:, None] - py[None, :]) ** 2
+    np.fill_diagonal(d2, np.inf)
+    return bool(np.all(d2 >= min_separation ** 2))
+
+
+def optimize_placement(polygon, n_radars, scan_limit_deg, r_max, blind_zone_m=0.0, k=1,
+                       slot_spacing=2.0, orientation_offsets=(-30.0, -15.0, 0.0, 15.0, 30.0),
+                       min_separation=2.0, n_initial=128, n_rounds=6, n_mutations=64,
+                       grid_res=0.25, top_n=5, n_workers=None, seed=None):
+    """Searches radar mounting slots and orientations that maximize arena coverage.
+
+    Radars are mounted on the arena perimeter (slots every slot_spacing m,
+    facing inward plus one of orientation_offsets) and kept at least
+    min_separation apart. The objective is the area seen by at least k
+    radars. A random initial population is refined for n_rounds by moving
+    or re-aiming single radars of the best layouts; each generation is
+    evaluated in a process pool (n_workers=1 evaluates serially).
+    Returns the top_n layouts with their coverage stats.
+    """
+    rng = np.random.default_rng(seed)
+    polygon = tuple(map(tuple, polygon))
+    slots = perimeter_slots(polygon, slot_spacing)
+    n_slots = len(slots[0])
+    n_orient = len(orientation_offsets)
+    if n_slots < n_radars:
+        raise ValueError(f"Only {n_slots} perimeter slots for {n_radars} radars; reduce slot_spacing")
+
+    def random_genome():
+        for _ in range(100):
+            g = tuple(sorted(zip(rng.choice(n_slots, n_radars, replace=False).tolist(),
+                                 rng.integers(n_orient, size=n_radars).tolist())))
+            if _separation_ok(g, slots, min_separation):
+                return g
+        return None
+
+    def mutate(g):
+        g = list(g)
+        i = rng.integers(len(g))
+        s, o = g[i]
+        if rng.random() < 0.5:
+            s = int((s + rng.integers(-3, 4)) % n_slots)
+        else:
+            o = int(rng.integers(n_orient))
+        g[i] = (s, o)
+        g = tuple(sorted(g))
+        return g if _separation_ok(g, slots, min_separation) else None
+
+    scored = {}
+
+    def evaluate(genomes, pool):
+        genomes = [g for g in dict.fromkeys(genomes) if g is not None and g not in scored]
+        jobs = [(_layout_radars(g, slots, scan_limit_deg, r_max, blind_zone_m, orientation_offsets), polygon, grid_res, k)
+                for g in genomes]
+        if pool is None:
+            results = map(_evaluate_job, jobs)
+        else:
+            results = pool.map(_evaluate_job, jobs, chunksize=max(1, len(jobs) // (4 * (n_workers or 4))))
+        for g, stats in zip(genomes, results):
+            scored[g] = stats
+
+    initial = [random_genome() for _ in range(n_initial)]
+    if all(g is None for g in initial):
+        raise ValueError(f"No placement of {n_radars} radars satisfies min_separation={min_separation} m "
+                         f"on the perimeter slots; reduce min_separation or n_radars")
+
+    pool = None if n_workers == 1 else ProcessPoolExecutor(max_workers=n_workers)
+    try:
+        evaluate(initial, pool)
+        for _ in range(n_rounds):
+            elite = sorted(scored, key=lambda g: scored[g]["score"], reverse=True)[:max(4, top_n)]
+            children = [mutate(elite[rng.integers(len(elite))]) for _ in range(n_mutations)]
+            evaluate(children, pool)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    best = sorted(scored, key=lambda g: scored[g]["score"], reverse=True)[:top_n]
+    return [
+        dict(scored[g], radars=_layout_radars(g, slots, scan_limit_deg, r_max, blind_zone_m, orientation_offsets))
+        for g in best
+    ]
+
+
+if __name__ == "__main__":
+    import time
+
+    print("--- Debugging Radar Placement ---")
+
+    arena = [(0, 0), (40, 0), (40, 25), (0, 25)]
+    t0 = time.time()
+    layouts = optimize_placement(arena, 4, 60, 22.5, blind_zone_m=1.0, k=1, n_initial=96, n_rounds=4, seed=0)
+    print(f"Search time: {time.time() - t0:.1f} s")
+    for rank, lay in enumerate(layouts, 1):
+        poses = ", ".join(f"({r['x']:.1f},{r['y']:.1f})@{r['boresight_deg']:.0f}°" for r in lay["radars"])
+        print(f"#{rank}: union {lay['area_union']:.1f} m² ({lay['coverage_fraction']*100:.1f}%) 2-cov {lay['area_k'][2]:.1f} m² | {poses}")
+
+    # Separation that no layout can meet
+    try:
+        optimize_placement(arena, 4, 60, 22.5, min_separation=100.0, n_workers=1, seed=0)
+    except ValueError as e:
+        print(f"Infeasible separation: {e}")
@@ -0,0 +1,86 @@
+import functools
+import threading
+from collections import OrderedDict
+
+
+# --- Bounded LRU Result Cache ---
+class LRUCache:
+    """Thread-safe, size-bounded LRU store with hit/miss counters.
+
+    Module-level instances live for the whole process, so every Streamlit
+    session (each runs in its own thread) shares the same results.
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+_MISSING = object()
+
+
+def memoize(cache):
+    """Caches a function's results in `cache`, keyed by its full argument tuple.
+
+    Arguments must be hashable. Cached dicts are returned as shallow copies
+    so callers cannot alter the stored result.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (func.__module__, func.__qualname__, args, tuple(sorted(kwargs.items())))
+            value = cache.get(key, _MISSING)
+            if value is _MISSING:
+                # Computed outside the lock; two sessions may race on a cold key, both get correct results
+                value = func(*args, **kwargs)
+                cache.put(key, value)
+            return dict(value) if isinstance(value, dict) else value
+        wrapper.cache = cache
+        return wrapper
+    return decorator
@@ -0,0 +1,135 @@
+import math
+import numpy as np
+
+from coverage_engine import _stack_radars, coverage_bounds, raster_grid, dual_radar_layout
+
+BOLTZMANN_DB = -228.6  # 10*log10(k), dBW/K/Hz
+
+
+# --- Link Budget ---
+def calculate_link_constant(p_t_dbm, g_elm_db, wavelength_m, sigma_dbsm, n_tx, n_rx, t_sys_k, w_bb_hz, loss_db):
+    """Calculates the range- and angle-independent part of the monostatic radar equation (dB).
+
+    SNR(R, theta) = K + 2 * pattern_db(theta) - 40 * log10(R), with K the
+    SNR at R = 1 m on boresight. Same terms as the Monostatic Power Budget
+    Calculator.
+    """
+    return (p_t_dbm - 30.0 + 2 * g_elm_db + 20 * math.log10(wavelength_m) + sigma_dbsm
+            + 10 * math.log10(n_tx * n_rx) - 10 * math.log10((4 * math.pi) ** 3)
+            - BOLTZMANN_DB - 10 * math.log10(t_sys_k) - 10 * math.log10(w_bb_hz) - loss_db)
+
+
+def element_pattern_exponent(hpbw_deg):
+    """Exponent q of a cos^q(theta) power pattern with the given -3 dB beamwidth."""
+    return math.log(0.5) / math.log(math.cos(math.radians(hpbw_deg / 2)))
+
+
+# --- Detection Probability ---
+def _erfc(x):
+    """Complementary error function (Abramowitz & Stegun 7.1.26, |err| < 1.5e-7), vectorized."""
+    a = np.abs(x)
+    t = 1.0 / (1.0 + 0.3275911 * a)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    y = poly * np.exp(-a * a)
+    return np.where(x >= 0, y, 2.0 - y)
+
+
+def calculate_pd(snr_db, pfa=1e-6):
+    """Single-look detection probability of a steady target (North's approximation)."""
+    snr = 10 ** (np.asarray(snr_db) / 10.0)
+    return 0.5 * _erfc(math.sqrt(-math.log(pfa)) - np.sqrt(snr + 0.5))
+
+
+def _required_snr_db(pd_min, pfa):
+    """Inverts calculate_pd by bisection (Pd is monotonic in SNR)."""
+    lo, hi = -30.0, 60.0
+    for _ in range(60):
+        mid = 0.5 * (lo + hi)
+        if calculate_pd(mid, pfa) < pd_min:
+            lo = mid
+        else:
+            hi = mid
+    return hi
+
+
+# --- SNR Coverage Raster ---
+def calculate_snr_coverage(radars, link_constant_db, grid_res, pattern_exponent=1.0, pfa=1e-6, pd_min=0.9,
+                           bounds=None, mem_budget_mb=64):
+    """Calculates per-cell best SNR and detection probability over the arena raster.
+
+    Each radar's valid region (range, blind zone, scan limit, occlusion
+    half-planes) is taken from the geometric model; inside it the SNR follows
+    the radar equation with a cos^q element pattern on transmit and receive.
+    Cells take the best radar. Rows are processed in blocks within
+    mem_budget_mb.
+
+    Returns float32 rasters snr_db (NaN where uncovered) and pd, plus the
+    geometric, detectable (Pd >= pd_min) and per-radar detectable areas.
+    """
+    n = len(radars)
+    if bounds is None:
+        bounds = coverage_bounds(radars)
+    x_grid, y_grid = raster_grid(bounds, grid_res)
+
+    p = _stack_radars(radars)
+    nx = len(x_grid)
+    bytes_per_cell = n * 28 + 8
+    rows = max(1, int(mem_budget_mb * 2**20 // (max(nx, 1) * bytes_per_cell)))
+
+    # SNR needed for pd_min, so the per-radar test avoids the erfc
+    snr_req_db = _required_snr_db(pd_min, pfa)
+    snr_map = np.full((len(y_grid), nx), np.nan, dtype=np.float32)
+    detect_cells = np.zeros(n, dtype=np.int64)
+
+    xx = x_grid[np.newaxis, np.newaxis, :]
+    for r0 in range(0, len(y_grid), rows):
+        yy = y_grid[np.newaxis, r0:r0 + rows, np.newaxis]
+
+        dx = xx - p["x"]
+        dy = yy - p["y"]
+        dist = np.sqrt(dx * dx + dy * dy)                  # (N, rows, nx)
+        cos_off = (dx * p["bx"] + dy * p["by"]) / np.maximum(dist, 1e-6)
+        visible = np.all(p["hp"][:, :, 0] * xx + p["hp"][:, :, 1] * yy >= p["hp"][:, :, 2], axis=1)
+        valid = (cos_off >= p["cos_scan"]) & (dist >= p["blind"]) & (dist <= p["r_max"]) & visible
+
+        with np.errstate(divide='ignore'):
+            snr = link_constant_db + (20 * pattern_exponent) * np.log10(np.maximum(cos_off, 1e-6)) - 40 * np.log10(dist)
+        snr = np.where(valid, snr, -np.inf).astype(np.float32)
+        del dist, cos_off, visible
+
+        detect_cells += np.count_nonzero(valid & (snr >= snr_req_db), axis=(1, 2))
+        best = snr.max(axis=0)
+        snr_map[r0:r0 + rows] = np.where(np.isfinite(best), best, np.nan)
+
+    pd_map = np.where(np.isnan(snr_map), 0.0, calculate_pd(np.nan_to_num(snr_map, nan=-100.0), pfa)).astype(np.float32)
+    cell_area = grid_res * grid_res
+    return {
+        "snr_db": snr_map,
+        "pd": pd_map,
+        "snr_required_db": snr_req_db,
+        "area_geometric": np.count_nonzero(~np.isnan(snr_map)) * cell_area,
+        "area_detect": np.count_nonzero(pd_map >= pd_min) * cell_area,
+        "area_detect_per_radar": detect_cells * cell_area,
+        "x_grid": x_grid,
+        "y_grid": y_grid,
+    }
+
+
+if __name__ == "__main__":
+    import time
+
+    print("--- Debugging SNR Coverage ---")
+
+    # Power Budget Calculator defaults (antenna pattern losses replaced by the element pattern)
+    wavelength = 3e8 / 77.5e9
+    sigma = 10 * math.log10(0.5 * 4 * math.pi * (math.pi * 0.01075 ** 2) ** 2 / wavelength ** 2)
+    k_db = calculate_link_constant(10.4, 5.5, wavelength, sigma, 324, 528, 300 * 10 ** 1.5, 50e3, 9.5)
+    print(f"Link constant: {k_db:.1f} dB -> SNR @ 8 m boresight {k_db - 40 * math.log10(8):.2f} dB")
+    print(f"Required SNR for Pd 0.9 @ Pfa 1e-6: {_required_snr_db(0.9, 1e-6):.2f} dB")
+
+    radars = dual_radar_layout(20.0, 22.5, 1.0, 60.0)
+    t0 = time.time()
+    res = calculate_snr_coverage(radars, k_db, 0.1, pattern_exponent=element_pattern_exponent(120.0))
+    print(f"Raster {res['snr_db'].shape} in {time.time() - t0:.3f} s")
+    print(f"Geometric: {res['area_geometric']:.1f} m², detectable: {res['area_detect']:.1f} m², "
+          f"per radar: {res['area_detect_per_radar']}")
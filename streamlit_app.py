@@ -9,6 +9,27 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import urllib.parse
+import os
+import tempfile
+import zipfile
+from frame_budget import calculate_frame_budget, INTERFACE_LIMITS, AWR2243_NUM_RX, AWR2243_NUM_TX
+from doppler_design import calculate_velocity_limits, solve_multi_prf
+from radar_interference import chirp_config, search_interference_free
+from coverage_engine import calculate_dual_coverage_exact, calculate_dual_coverage_quadtree, calculate_dual_coverage_chunked, COVERAGE_CACHE
+from coverage_engine import dual_radar_layout, radar_wedge_polygon, calculate_multi_coverage, coverage_bounds
+from snr_coverage import calculate_link_constant, element_pattern_exponent, calculate_snr_coverage
+from occlusion import parse_obstacles, calculate_obstacle_coverage, VISIBILITY_CACHE
+from volume_coverage import calculate_volume_coverage
+from trajectory_mc import passage_lanes, simulate_trajectories
+from tracker import run_tracking_scenario
+from coverage_export import export_dual_coverage_classes, open_coverage_raster, class_areas, dual_class_poses
+from coverage_export import CLASS_R1_ONLY, CLASS_R2_ONLY, CLASS_BOTH, CLASS_BLOCKED, CLASS_BLIND
+from coverage_render import CLASS_COLORS, lod_class_raster, class_heatmap
+from result_cache import memoize
+from array_factor import array_weights, steered_array_factor, direct_array_factor, visible_u_pattern, fft_size, PATTERN_CACHE
+from beam_metrics import pattern_metrics, grating_lobe_u
+from planar_pattern import planar_u_pattern, cut_weights, steered_uv_pattern, pool_max, planar_metrics, PLANAR_CACHE, STEERED_CACHE
+from virtual_array import cached_t_shape_virtual_array, virtual_weights
 
 # --- E-Series Data ---
 E24 = [
@@ -61,6 +82,10 @@ def format_eng(value):
      # Keep old for backward compatibility if needed, or redirect
     return format_engineering(value, "")
 
+def format_lobe_level(level_db):
+    """Lobe level relative to the main beam; clamped at 0 dB so an interpolated grating lobe never reads +0.0 / -0.0."""
+    return f"{level_db if level_db <= -0.05 else 0.0:.1f} dB"
+
 def find_nearest_e_series(value, series_name):
     if value <= 0:
         return value
@@ -146,7 +171,7 @@ def draw_feedback_schematic(r1, r2, vout, vfb):
         return d
 
 # --- Constants ---
-APP_VERSION = "Rev 3.29"
+APP_VERSION = "Rev 3.50"
 
 # --- Near Field Helper Function ---
 def calculate_near_field(d_aperture, wavelength):
@@ -276,7 +301,13 @@ def render_3d_shape(shape_type):
     return fig
 
 # --- Dual Coverage Helper ---
-def calculate_dual_coverage(r1_active, r2_active, radar_sep, r_max, blind_zone_m, scan_limit_deg, grid_res):
+def calculate_dual_coverage(r1_active, r2_active, radar_sep, r_max, blind_zone_m, scan_limit_deg, grid_res, mem_budget_mb=None):
+    # Streaming mode: row blocks, float32 and packed bit masks within a fixed memory budget
+    if mem_budget_mb is not None:
+        return calculate_dual_coverage_chunked(
+            r1_active, r2_active, radar_sep, r_max, blind_zone_m, scan_limit_deg, grid_res, mem_budget_mb=mem_budget_mb
+        )
+
     # 1. Define Symmetrical Y-Grid (Relative to Midpoint)
     midpoint = radar_sep / 2.0
     y_extent = r_max + 5.0
@@ -355,6 +386,49 @@ def calculate_dual_coverage(r1_active, r2_active, radar_sep, r_max, blind_zone_m
         "area_blocked": area_blocked
     }
 
+# --- Memoized Coverage Dispatch ---
+# Keyed by the full parameter tuple; unchanged geometry is free on rerun (e.g. moving tape-measure probes)
+@memoize(COVERAGE_CACHE)
+def get_dual_coverage(area_method, r1_active, r2_active, radar_sep, r_max, blind_zone_m, scan_limit_deg):
+    if area_method == "Exact (Analytic)":
+        return calculate_dual_coverage_exact(
+            r1_active, r2_active, radar_sep, r_max, blind_zone_m, scan_limit_deg
+        )
+    elif area_method == "Quadtree (1 cm Raster)":
+        return calculate_dual_coverage_quadtree(
+            r1_active, r2_active, radar_sep, r_max, blind_zone_m, scan_limit_deg, min_cell=0.01
+        )
+    return calculate_dual_coverage(
+        r1_active, r2_active, radar_sep, r_max, blind_zone_m, scan_limit_deg, grid_res=0.1, mem_budget_mb=64
+    )
+
+# --- Memoized Virtual Array Pattern ---
+# Steering-invariant periodic (u, v) pattern of the T-Shape virtual array; steering only re-samples it
+@memoize(PLANAR_CACHE)
+def get_virtual_pattern(n_rx, n_tx, d_rx_m, d_tx_m, w_name, wavelength):
+    # Virtual element per TX/RX pair at RX x_i + TX y_j, as compact integer lattice offsets (Rev 3.50),
+    # tapered on both axes; the same cached array feeds the inventory caption
+    va = cached_t_shape_virtual_array(n_rx, n_tx, w_name)
+    weights = virtual_weights(va)
+    n_u = fft_size(n_rx, d_rx_m, wavelength, 0.0, oversample=2)
+    n_v = fft_size(n_tx, d_tx_m, wavelength, 0.0, oversample=2)
+    pattern = planar_u_pattern(va["ix"], va["iy"], weights, n_u, n_v)
+    pattern.flags.writeable = False
+    w_x, w_y = cut_weights(va["ix"], va["iy"], weights)
+    return {"pattern": pattern, "w_x": w_x, "w_y": w_y, "n_virtual": len(weights)}
+
+# Steered view of it: metrics and the pooled display, so reruns at the same steering skip the full visible grid
+@memoize(STEERED_CACHE)
+def get_virtual_view(n_rx, n_tx, d_rx_m, d_tx_m, w_name, wavelength, u0):
+    vp = get_virtual_pattern(n_rx, n_tx, d_rx_m, d_tx_m, w_name, wavelength)
+    u_vis, v_vis, amp_vis = steered_uv_pattern(vp["pattern"], d_rx_m, d_tx_m, wavelength, u0)
+    metrics = planar_metrics(u_vis, v_vis, amp_vis, vp["w_x"], vp["w_y"], d_rx_m, d_tx_m, wavelength, u0)
+    # Display: block-max pooled so no lobe is lost at screen resolution
+    u_p, v_p, amp_p = pool_max(u_vis, v_vis, amp_vis, max_cells=160_000)
+    db_p = (20 * np.log10(np.maximum(amp_p / np.nanmax(amp_p), 1e-3))).astype(np.float32)
+    db_p.flags.writeable = False
+    return {"metrics": metrics, "u": u_p, "v": v_p, "db": db_p, "shape": amp_vis.shape, "n_virtual": vp["n_virtual"]}
+
 # --- Main App ---
 st.set_page_config(page_title="Scanary HW tool", layout="wide")
 st.title("Scanary HW tool")
@@ -961,6 +1035,108 @@ elif selected_tool == "RADAR Calculator":
             if r_max < 5.0:
                 st.error("Warning: Max range is very small (< 5m). Consider lowering slope or increasing sampling rate.")
 
+        # --- Frame Timing & Data Rate (Rev 3.30) ---
+        with st.expander("🎞️ Frame Timing & Data Rate Budget", expanded=False):
+            col_fr1, col_fr2, col_fr3 = st.columns(3)
+            with col_fr1:
+                idle_us = st.number_input("Idle Time (µs)", value=10.0, min_value=0.0, step=0.5, key="fr_idle")
+                adc_start_us = st.number_input("ADC Start Time (µs)", value=6.0, min_value=0.0, step=0.5, key="fr_adc_start")
+                ramp_end_us = st.number_input("Ramp End Time (µs)", value=round(6.0 + T_chirp * 1e6 + 1.0, 2), min_value=0.1, step=0.5, key="fr_ramp_end")
+            with col_fr2:
+                n_loops = st.number_input("Chirp Loops per Frame", value=128, min_value=1, step=1, key="fr_loops")
+                n_tx_frame = st.number_input("TX (TDM-MIMO)", value=AWR2243_NUM_TX, min_value=1, max_value=AWR2243_NUM_TX, step=1, key="fr_tx")
+                n_rx_frame = st.number_input("Active RX", value=AWR2243_NUM_RX, min_value=1, max_value=AWR2243_NUM_RX, step=1, key="fr_rx")
+            with col_fr3:
+                frame_period_ms = st.number_input("Frame Period (ms)", value=50.0, min_value=0.1, step=1.0, key="fr_period")
+                fr_interface = st.selectbox("Data Interface", list(INTERFACE_LIMITS.keys()), key="fr_iface")
+                fr_lanes = st.number_input("Lanes", value=INTERFACE_LIMITS[fr_interface]["lanes"], min_value=1, max_value=INTERFACE_LIMITS[fr_interface]["lanes"], step=1, key="fr_lanes")
+
+            fb = calculate_frame_budget(
+                n_samples, Fs, idle_us * 1e-6, adc_start_us * 1e-6, ramp_end_us * 1e-6,
+                n_loops, n_tx_frame, frame_period_ms * 1e-3, n_rx=n_rx_frame,
+                sampling_mode=sampling_mode, interface=fr_interface, n_lanes=fr_lanes
+            )
+
+            c_fm1, c_fm2, c_fm3, c_fm4 = st.columns(4)
+            c_fm1.metric("Chirp Cycle", f"{float(fb['t_chirp_cycle'])*1e6:.2f} µs")
+            c_fm2.metric("Active Frame", f"{float(fb['t_frame_active'])*1e3:.2f} ms", help=f"Duty cycle {float(fb['duty_cycle'])*100:.1f}%")
+            c_fm3.metric("Interface Load", f"{float(fb['rate_active_total'])/1e6:.1f} Mbps", help=f"{float(fb['interface_util'])*100:.1f}% of {float(fb['interface_capacity'])/1e6:.0f} Mbps")
+            c_fm4.metric("Storage", f"{float(fb['storage_per_hour'])/1e9:.1f} GB/h")
+
+            st.write(f"**Raw Rate per RX (ADC burst):** {float(fb['rate_adc_rx'])/1e6:.1f} Mbps")
+            st.write(f"**Average Rate per RX:** {float(fb['rate_avg_rx'])/1e6:.1f} Mbps")
+            st.write(f"**Chirps per Frame:** {int(fb['chirps_per_frame'])}  |  **Frame Rate:** {float(fb['frame_rate']):.1f} fps")
+
+            if not fb["ramp_ok"]:
+                st.error("ADC window does not fit in the ramp: ADC Start + N/Fs > Ramp End.")
+            if not fb["frame_ok"]:
+                st.error("Active chirps exceed the frame period. Reduce loops/TX or increase the frame period.")
+            if not fb["interface_ok"]:
+                st.error(f"{fr_interface} throughput exceeded ({float(fb['interface_util'])*100:.0f}% load).")
+
+            # Sweep: interface load vs loops for the current timing
+            loops_sweep = np.arange(1, 513)
+            fb_sweep = calculate_frame_budget(
+                n_samples, Fs, idle_us * 1e-6, adc_start_us * 1e-6, ramp_end_us * 1e-6,
+                loops_sweep, n_tx_frame, frame_period_ms * 1e-3, n_rx=n_rx_frame,
+                sampling_mode=sampling_mode, interface=fr_interface, n_lanes=fr_lanes
+            )
+            fig_fr = go.Figure()
+            fig_fr.add_trace(go.Scatter(x=loops_sweep, y=fb_sweep["duty_cycle"] * 100, mode='lines', name='Frame Duty Cycle (%)'))
+            fig_fr.add_trace(go.Scatter(x=loops_sweep, y=fb_sweep["storage_per_hour"] / 1e9, mode='lines', name='Storage (GB/h)', yaxis='y2'))
+            fig_fr.add_vline(x=n_loops, line_color="red", line_dash="dash")
+            fig_fr.add_hline(y=100, line_color="gray", line_dash="dot")
+            fig_fr.update_layout(
+                title="Frame Budget vs Chirp Loops", xaxis_title="Chirp Loops per Frame",
+                yaxis=dict(title="Duty Cycle (%)"), yaxis2=dict(title="Storage (GB/h)", overlaying='y', side='right'),
+                margin=dict(l=20, r=20, t=30, b=20), height=300
+            )
+            st.plotly_chart(fig_fr, use_container_width=True)
+
+            st.markdown(r"""
+            *   $T_{cycle} = T_{idle} + T_{ramp,end}$, $\;T_{ADC,start} + N/F_s \le T_{ramp,end}$
+            *   $T_{active} = N_{loops} \times N_{TX} \times T_{cycle} \le T_{frame}$
+            *   $R_{if} = N_{RX} \times N \times N_{IQ} \times N_{bits} / T_{cycle}$
+            *   $Storage = R_{avg} \times 3600 / 8$ [B/h]
+            """)
+
+        # --- Doppler / Velocity Design (Rev 3.31) ---
+        with st.expander("🚀 Doppler & Velocity Ambiguity", expanded=False):
+            col_dp1, col_dp2 = st.columns(2)
+            with col_dp1:
+                f_start_dp = st.number_input("Start Frequency (GHz)", value=77.0, min_value=1.0, step=0.1, format="%.2f", key="dp_f0")
+                # Doppler is evaluated at the chirp center frequency
+                fc_dp = f_start_dp * 1e9 + BW / 2.0
+                vel = calculate_velocity_limits(fc_dp, float(fb["t_chirp_cycle"]), n_loops, n_tx=n_tx_frame, c=c_speed)
+                st.write(f"**Doppler Period (N_TX × T_cycle):** {float(vel['t_doppler'])*1e6:.2f} µs")
+                st.write(f"**Max Unambiguous Velocity:** ±{float(vel['v_max']):.2f} m/s")
+                st.write(f"**Velocity Resolution:** {float(vel['v_res'])*100:.2f} cm/s")
+                st.latex(r"v_{max} = \frac{\lambda}{4 T_c}, \quad \Delta v = \frac{\lambda}{2 N_{loops} T_c}")
+            with col_dp2:
+                st.markdown("**Multi-PRF (CRT) Unfolding**")
+                n_prf = st.selectbox("Number of PRFs", [2, 3], key="dp_nprf")
+                idle_max_us = st.number_input("Max Idle Time (µs)", value=max(40.0, idle_us), min_value=idle_us, step=1.0, key="dp_idle_max")
+                idle_step_us = st.number_input("Idle Time Step (µs)", value=1.0, min_value=0.1, step=0.1, key="dp_idle_step")
+                v_tol = st.number_input("Velocity Tolerance (m/s)", value=round(float(vel['v_res']), 3), min_value=0.001, step=0.01, format="%.3f", key="dp_tol", help="Expected velocity measurement error (default: one Doppler bin)")
+
+            # Candidate periods: vary idle time, keep the ramp fixed
+            idle_cands = np.arange(idle_us, idle_max_us + idle_step_us / 2, idle_step_us) * 1e-6
+            period_cands = n_tx_frame * (idle_cands + ramp_end_us * 1e-6)
+            if len(period_cands) > 80:
+                st.warning(f"{len(period_cands)} candidate periods; only the first 80 are searched.")
+                period_cands = period_cands[:80]
+            crt = solve_multi_prf(period_cands, fc_dp, n_prf=n_prf, v_tol=v_tol, top_n=5, c=c_speed)
+
+            if len(crt["span"]) > 0:
+                crt_df = pd.DataFrame({
+                    "Idle Times (µs)": [", ".join(f"{(t / n_tx_frame - ramp_end_us * 1e-6)*1e6:.1f}" for t in p) for p in crt["periods"]],
+                    "Doppler Periods (µs)": [", ".join(f"{t*1e6:.1f}" for t in p) for p in crt["periods"]],
+                    "Unambiguous Velocity (± m/s)": [f"{v:.2f}" + ("" if ok else " (≥)") for v, ok in zip(crt["v_max"], crt["found"])],
+                })
+                st.table(crt_df)
+            else:
+                st.info("Not enough candidate periods for the selected number of PRFs.")
+
         # --- Formulas Panel ---
         with st.expander("Formulas & Definitions", expanded=True):
             st.markdown("### Definitions")
@@ -1108,9 +1284,55 @@ elif selected_tool == "RADAR Calculator":
                  tm_dist = math.sqrt((tm_x2 - tm_x1)**2 + (tm_y2 - tm_y1)**2)
                  st.metric("Measured Distance", f"{tm_dist:.2f} m")
         
-        # 1. Grid-Based Calculation (Union / Intersection / Occlusion)
-        res = calculate_dual_coverage(
-            r1_active, r2_active, radar_sep, r_max, blind_zone_m, scan_limit_deg, grid_res=0.1
+        # --- Mutual Interference (Rev 3.32) ---
+        with st.expander("📡 Mutual Interference (Facing Radars)", expanded=False):
+            st.caption("Radar 1 uses the chirp/frame settings above. Radar 2 may use a different slope and a start-time offset.")
+            c_if1, c_if2 = st.columns(2)
+            with c_if1:
+                r2_slope = st.number_input("Radar 2 Slope (MHz/µs)", value=float(slope), min_value=0.1, format="%.3f", key="if_r2_slope")
+            with c_if2:
+                r2_offset_us = st.number_input("Radar 2 Start Offset (µs)", value=0.0, step=1.0, format="%.2f", key="if_r2_offset")
+
+            # Sweep only on request, so other widgets on the page rerun without it
+            if st.checkbox("Run Interference Analysis", value=False, key="if_run"):
+                r1_cfg = chirp_config(fc_dp - BW / 2.0, S, idle_us * 1e-6, ramp_end_us * 1e-6, adc_start_us * 1e-6, T_chirp,
+                                      int(fb["chirps_per_frame"]), frame_period_ms * 1e-3, if_max)
+                r2_cfg = dict(r1_cfg)
+                r2_cfg["slope"] = r2_slope * 1e12
+
+                t_cycle_if = float(fb["t_chirp_cycle"])
+                offsets_if = np.linspace(0, 2 * t_cycle_if, 401)
+                sweep_if = search_interference_free(r1_cfg, r2_cfg, offsets_if, radar_sep, c=c_speed)
+                cur_if = search_interference_free(r1_cfg, r2_cfg, r2_offset_us * 1e-6, radar_sep, c=c_speed)
+
+                c_im1, c_im2, c_im3 = st.columns(3)
+                c_im1.metric("R1 ADC Time Hit", f"{float(cur_if['a_victim']['overlap_fraction'])*100:.2f} %", help="Fraction of Radar 1 ADC time with Radar 2 in the IF band")
+                c_im2.metric("R2 ADC Time Hit", f"{float(cur_if['b_victim']['overlap_fraction'])*100:.2f} %", help="Fraction of Radar 2 ADC time with Radar 1 in the IF band")
+                ghost_r = float(cur_if['a_victim']['ghost_range_min'])
+                c_im3.metric("Ghost Target (R1)", "None" if np.isnan(ghost_r) else f"{ghost_r:.2f} m", help="Equal slopes give a constant beat, i.e. a ghost target")
+
+                n_free = int(np.sum(sweep_if["interference_free"]))
+                if n_free:
+                    st.success(f"{n_free} of {len(offsets_if)} offsets over 2 chirp cycles are interference-free.")
+                else:
+                    st.warning("No interference-free offset found. Try a different Radar 2 slope.")
+
+                fig_if = go.Figure()
+                fig_if.add_trace(go.Scatter(x=offsets_if * 1e6, y=sweep_if["a_victim"]["overlap_fraction"] * 100, mode='lines', name='Radar 1 victim'))
+                fig_if.add_trace(go.Scatter(x=offsets_if * 1e6, y=sweep_if["b_victim"]["overlap_fraction"] * 100, mode='lines', name='Radar 2 victim'))
+                fig_if.add_vline(x=r2_offset_us, line_color="red", line_dash="dash")
+                fig_if.update_layout(title="Interference vs Start Offset", xaxis_title="Radar 2 Start Offset (µs)", yaxis_title="ADC Time Hit (%)",
+                                     margin=dict(l=20, r=20, t=30, b=20), height=300)
+                st.plotly_chart(fig_if, use_container_width=True)
+
+        # 1. Area Calculation (Union / Intersection / Occlusion)
+        # Rev 3.33: Exact analytic engine by default, grid raster kept for cross-checking
+        # Rev 3.34: Adaptive quadtree raster (1 cm, refined only along region boundaries)
+        area_method = st.radio("Area Method", ["Exact (Analytic)", "Quadtree (1 cm Raster)", "Grid (0.1 m Raster)"], horizontal=True, key="area_method")
+        
+        # Rev 3.36: Memoized across reruns and sessions (bounded LRU)
+        res = get_dual_coverage(
+            area_method, r1_active, r2_active, float(radar_sep), float(r_max), float(blind_zone_m), float(scan_limit_deg)
         )
         
         area_union = res['area_union']
@@ -1119,10 +1341,8 @@ elif selected_tool == "RADAR Calculator":
         area_r2_only = res['area_r2_only']
         area_blocked = res['area_blocked']
 
-        # Total Blind Area (Analytical) - Restored
-        total_blind_area_dual = 0.0
-        if r1_active: total_blind_area_dual += area_blind_single
-        if r2_active: total_blind_area_dual += area_blind_single
+        # Total Blind Area: union of both occlusion-clipped blind zones, the same quantity for every Area Method
+        total_blind_area_dual = res['area_blind']
 
         # Metrics Equality Check (Strict)
         # 1. Round to 2 decimals first to clean float noise
@@ -1139,138 +1359,148 @@ elif selected_tool == "RADAR Calculator":
         c_d3.metric("Blocked Area (Shadow)", f"{area_blocked:.1f} m²", help="Theoretical coverage blocked by the other radar")
         c_d4.metric("Total Blind Area", f"{total_blind_area_dual:.2f} m²", help="Near-field blind zones")
         
-        with st.expander("Methodology: Grid-Based Integration"):
-            st.markdown("""
-            **Area Calculation Method:**
-            1.  **Grid:** High-precision centered mesh ($\Delta = 0.1$ m) ensures symmetry.
-            2.  **Occlusion (Shadowing):**
-                *   Radar 1 (Bottom) is blocked for $Y > \text{Separation}$.
-                *   Radar 2 (Top) is blocked for $Y < 0$.
-            3.  **Metrics:**
-                *   **Usable:** Valid areas respecting occlusion.
-                *   **Blocked:** Area lost due to shadowing.
-            """)
-            st.latex(r"A \approx N_{points} \times \Delta_{grid}^2")
+        method_titles = {"Exact (Analytic)": "Exact Slice Integration", "Quadtree (1 cm Raster)": "Adaptive Quadtree", "Grid (0.1 m Raster)": "Grid-Based Integration"}
+        with st.expander(f"Methodology: {method_titles[area_method]}"):
+            if area_method == "Exact (Analytic)":
+                st.markdown("""
+                **Area Calculation Method:**
+                1.  **Slices:** Every region is symmetric in X, so a horizontal slice at height $y$ is an interval $[x_{lo}(y), x_{hi}(y)]$ bounded by sector edges (lines) and $R_{max}$ / blind-zone arcs (circles).
+                2.  **Breakpoints:** All line/circle intersections split $y$ into pieces where the active boundaries are fixed.
+                3.  **Integration:** Each piece is integrated in closed form (exact, independent of arena scale).
+                4.  **Occlusion (Shadowing):**
+                    *   Radar 1 (Bottom) is blocked for $Y > \text{Separation}$.
+                    *   Radar 2 (Top) is blocked for $Y < 0$.
+                """)
+                st.latex(r"A = 2\int \max\left(0, \min_i x_{hi,i}(y) - \max_j x_{lo,j}(y)\right) dy")
+            elif area_method == "Quadtree (1 cm Raster)":
+                st.markdown(f"""
+                **Area Calculation Method:**
+                1.  **Blocks:** The arena is split into square blocks. Each test (range disk, sector edges, occlusion line) is bounded over the whole block.
+                2.  **Refinement:** Blocks fully inside or outside every region are accepted whole; only blocks crossed by a boundary are split in four.
+                3.  **Finest Level:** At $\Delta = 1$ cm the block is classified by its center, like a uniform raster.
+                4.  **Cost:** {res['n_evaluations']:,} block evaluations instead of {int((2 * (r_max + 5) / 0.01) ** 2):,} uniform cells.
+                """)
+                st.latex(r"A = \sum_{uniform\ blocks} s_{block}^2")
+            else:
+                st.markdown("""
+                **Area Calculation Method:**
+                1.  **Grid:** High-precision centered mesh ($\Delta = 0.1$ m) ensures symmetry.
+                    *   Evaluated in row blocks (float32, 1-bit packed masks) within a 64 MB budget.
+                2.  **Occlusion (Shadowing):**
+                    *   Radar 1 (Bottom) is blocked for $Y > \text{Separation}$.
+                    *   Radar 2 (Top) is blocked for $Y < 0$.
+                3.  **Metrics:**
+                    *   **Usable:** Valid areas respecting occlusion.
+                    *   **Blocked:** Area lost due to shadowing.
+                """)
+                st.latex(r"A \approx N_{points} \times \Delta_{grid}^2")
+
+            cache_stats = COVERAGE_CACHE.stats()
+            st.caption(f"Coverage cache: {cache_stats['size']}/{cache_stats['maxsize']} entries, "
+                       f"{cache_stats['hits']} hits / {cache_stats['misses']} misses ({cache_stats['hit_rate']*100:.0f}% hit rate)")
 
         # 2. Visualization (Passage Map - Cartesian)
         fig_pass = go.Figure()
         
-        # Helper: Generate Wedge Polygon with explicitly defined R_in and R_out per angle
-        def get_explicit_wedge_coords(cx, cy, base_r_in, base_r_out, center_deg, half_fov_deg, y_limit, is_r1, is_shadow_mode=False):
-            # is_shadow_mode: If True, we want the part of the wedge that exceeds the limit (Occluded).
-            # If False, we want the part within the limit (Valid).
-            
-            angles = np.linspace(center_deg - half_fov_deg, center_deg + half_fov_deg, 150)
-            rads = np.radians(angles)
-            
-            r_inner_arr = np.full_like(rads, base_r_in)
-            r_outer_arr = np.full_like(rads, base_r_out)
-            
-            for i, th in enumerate(rads):
-                sin_th = np.sin(th)
-                if abs(sin_th) < 1e-6: continue
-                
-                # Calculate radial distance to the limit line (y = cy + r*sin)
-                r_to_limit = (y_limit - cy) / sin_th
-                
-                if is_r1:
-                    # R1 (Bottom) -> Shadow is y > y_limit (Sep). Valid is y <= Sep.
-                    # R1 sin_th > 0 (roughly).
-                    if sin_th > 0:
-                        if is_shadow_mode:
-                            # Shadow starts at limit, goes to max
-                            # Cap inner at limit
-                            if r_to_limit > base_r_in:
-                                r_inner_arr[i] = min(r_to_limit, base_r_out) # Don't start past max
-                        else: # Valid mode
-                            # Valid ends at limit
-                            if r_to_limit < base_r_out:
-                                r_outer_arr[i] = max(r_to_limit, base_r_in) # Don't end before min
-                
-                else:
-                    # R2 (Top) -> Shadow is y < y_limit (0). Valid is y >= 0.
-                    # R2 sin_th < 0 (roughly).
-                    # Check inequality sign for division by negative.
-                    # y = Sep + r*sin. y < 0 => r*sin < -Sep => r > -Sep/sin (flipped > bc sin neg? No.)
-                    # Example: -10 < -1 * r. 10 > r. Wait.
-                    # r*sin < y_lim - cy.
-                    # If sin < 0, divide by sin flips: r > (y_lim - cy)/sin.
-                    # So Shadow is r > r_to_limit.
-                    
-                    if sin_th < 0:
-                         if is_shadow_mode:
-                              # Shadow is r > r_to_limit
-                              if r_to_limit > base_r_in:
-                                   r_inner_arr[i] = min(r_to_limit, base_r_out)
-                         else:
-                              # Valid is r <= r_to_limit
-                              if r_to_limit < base_r_out:
-                                   r_outer_arr[i] = max(r_to_limit, base_r_in)
-
-            # Generate Poly
-            x_in = cx + r_inner_arr * np.cos(rads)
-            y_in = cy + r_inner_arr * np.sin(rads)
-            x_out = cx + r_outer_arr * np.cos(rads[::-1])
-            y_out = cy + r_outer_arr * np.sin(rads[::-1]) # Reverse for poly closure
-            
-            x_poly = np.concatenate([x_in, x_out, [x_in[0]]])
-            y_poly = np.concatenate([y_in, y_out, [y_in[0]]])
-            return x_poly, y_poly
-
-        # Draw Layers
-        
-        # Layer 1: Shadows (Explicitly Calculated)
-        if r1_active:
-             # R1 Shadow (Part > Sep)
-             sx1, sy1 = get_explicit_wedge_coords(0, 0, blind_zone_m, r_max, 90, scan_limit_deg, radar_sep, True, is_shadow_mode=True)
-             fig_pass.add_trace(go.Scatter(x=sx1, y=sy1, fill='toself', mode='none', 
-                name=f"Shadow/Blocked ({area_blocked:.1f} m²)", 
-                fillcolor='rgba(128, 128, 128, 0.4)', showlegend=True, hoverinfo='skip'))
-
-        if r2_active:
-             # R2 Shadow (Part < 0)
-             sx2, sy2 = get_explicit_wedge_coords(0, radar_sep, blind_zone_m, r_max, 270, scan_limit_deg, 0, False, is_shadow_mode=True)
-             # Legend handled by R1 trace usually
-             show_leg = True if not r1_active else False
-             fig_pass.add_trace(go.Scatter(x=sx2, y=sy2, fill='toself', mode='none', 
-                name=f"Shadow/Blocked ({area_blocked:.1f} m²)", 
-                fillcolor='rgba(128, 128, 128, 0.4)', showlegend=show_leg, hoverinfo='skip'))
-
-        # Layer 2: Usable Coverage
-        if r1_active:
-            vx1, vy1 = get_explicit_wedge_coords(0, 0, blind_zone_m, r_max, 90, scan_limit_deg, radar_sep, True, is_shadow_mode=False)
-            fig_pass.add_trace(go.Scatter(x=vx1, y=vy1, fill='toself', mode='lines', 
-                name=f"Radar 1 Only ({area_r1_only:.1f} m²)", 
-                line=dict(color='blue', width=1), fillcolor='rgba(0, 0, 255, 0.3)', hoverinfo='skip'))
-            fig_pass.add_trace(go.Scatter(x=[0], y=[-2], mode='text', text=['RADAR 1'], textfont=dict(size=14, color='black'), showlegend=False))
-
-        if r2_active:
-            vx2, vy2 = get_explicit_wedge_coords(0, radar_sep, blind_zone_m, r_max, 270, scan_limit_deg, 0, False, is_shadow_mode=False)
-            fig_pass.add_trace(go.Scatter(x=vx2, y=vy2, fill='toself', mode='lines', 
-                name=f"Radar 2 Only ({area_r2_only:.1f} m²)", 
-                line=dict(color='red', width=1), fillcolor='rgba(255, 0, 0, 0.3)', hoverinfo='skip'))
-            fig_pass.add_trace(go.Scatter(x=[0], y=[radar_sep + 2], mode='text', text=['RADAR 2'], textfont=dict(size=14, color='black'), showlegend=False))
-
-        # Layer 3: Intersection Marker (Dummy for Legend)
-        if r1_active and r2_active:
-             fig_pass.add_trace(go.Scatter(x=[None], y=[None], mode='markers', 
-                marker=dict(size=10, color='purple', opacity=0.5),
-                name=f"Dual Coverage ({area_intersect:.1f} m²)", showlegend=True))
-
-        # Layer 4: Blind Zones (Implicitly circular at origin, always 'valid' in geometric sense relative to radar)
-        # Note: Blind Zone metric is strictly near-field.
-        if r1_active and blind_zone_m > 0:
-             bx1, by1 = get_explicit_wedge_coords(0, 0, 0, blind_zone_m, 90, scan_limit_deg, 9999, True, is_shadow_mode=False)
-             fig_pass.add_trace(go.Scatter(x=bx1, y=by1, fill='toself', mode='lines', 
-                name=f"Blind Zone ({total_blind_area_dual:.1f} m²)", 
-                line=dict(color='rgb(50,50,50)', width=1), fillcolor='rgba(50,50,50,0.8)', hoverinfo='skip'))
-
-        if r2_active and blind_zone_m > 0:
-             bx2, by2 = get_explicit_wedge_coords(0, radar_sep, 0, blind_zone_m, 270, scan_limit_deg, -9999, False, is_shadow_mode=False)
-             show_leg_blind = True if (not r1_active) else False
-             fig_pass.add_trace(go.Scatter(x=bx2, y=by2, fill='toself', mode='lines', 
-                name=f"Blind Zone ({total_blind_area_dual:.1f} m²)", 
-                line=dict(color='rgb(50,50,50)', width=1), fillcolor='rgba(50,50,50,0.8)', showlegend=show_leg_blind, hoverinfo='skip'))
+        # Rev 3.44: Raster render path (single heatmap, zoom-dependent LOD) next to the vector polygons
+        render_mode = st.radio("Render Mode", ["Vector (Polygons)", "Raster (Heatmap, LOD)"], horizontal=True, key="render_mode")
+        pass_view = None
+
+        if render_mode == "Raster (Heatmap, LOD)":
+            full_w = 2 * (r_max + 5.0)
+            full_h = radar_sep + 2 * (r_max + 5.0)
+            col_lod1, col_lod2, col_lod3, col_lod4 = st.columns(4)
+            with col_lod1:
+                lod_zoom = st.select_slider("Zoom", options=[1, 2, 4, 8, 16, 32], value=1, key="lod_zoom")
+            with col_lod2:
+                lod_cx = st.number_input("View Center X (m)", value=0.0, step=1.0, key="lod_cx")
+            with col_lod3:
+                lod_cy = st.number_input("View Center Y (m)", value=radar_sep / 2.0, step=1.0, key="lod_cy")
+            with col_lod4:
+                lod_cells = st.select_slider("Max Cells", options=[40_000, 80_000, 160_000, 320_000], value=160_000, key="lod_cells",
+                                             help="Upper bound on raster cells sent to the browser; figure size does not depend on zoom.")
+            pass_view = (lod_cx - full_w / 2 / lod_zoom, lod_cy - full_h / 2 / lod_zoom,
+                         lod_cx + full_w / 2 / lod_zoom, lod_cy + full_h / 2 / lod_zoom)
+            lod_x, lod_y, lod_cls = lod_class_raster(
+                dual_class_poses(r1_active, r2_active, radar_sep, r_max, blind_zone_m, scan_limit_deg), pass_view, lod_cells)
+            fig_pass.add_trace(class_heatmap(lod_x, lod_y, lod_cls))
+            st.caption(f"Raster cell: {(lod_x[1] - lod_x[0]) * 100:.1f} cm, {lod_cls.size:,} cells")
+
+            # Legend entries (heatmaps have none)
+            lod_legend = [(CLASS_R1_ONLY, f"Radar 1 Only ({area_r1_only:.1f} m²)", r1_active),
+                          (CLASS_R2_ONLY, f"Radar 2 Only ({area_r2_only:.1f} m²)", r2_active),
+                          (CLASS_BOTH, f"Dual Coverage ({area_intersect:.1f} m²)", r1_active and r2_active),
+                          (CLASS_BLOCKED, f"Shadow/Blocked ({area_blocked:.1f} m²)", True),
+                          (CLASS_BLIND, f"Blind Zone ({total_blind_area_dual:.1f} m²)", blind_zone_m > 0)]
+            for cls_id, label, show in lod_legend:
+                if show:
+                    fig_pass.add_trace(go.Scatter(x=[None], y=[None], mode='markers', name=label,
+                                                  marker=dict(size=10, symbol='square', color=CLASS_COLORS[cls_id])))
+            if r1_active:
+                fig_pass.add_trace(go.Scatter(x=[0], y=[-2], mode='text', text=['RADAR 1'], textfont=dict(size=14, color='black'), showlegend=False))
+            if r2_active:
+                fig_pass.add_trace(go.Scatter(x=[0], y=[radar_sep + 2], mode='text', text=['RADAR 2'], textfont=dict(size=14, color='black'), showlegend=False))
+        else:
+            # Wedge outlines from the shared vectorized builder (Rev 3.37)
+            wedge_pts = st.select_slider("Outline Resolution (points per arc)", options=[150, 500, 2000, 10000], value=150,
+                                         key="wedge_pts", help="Higher values give smoother arcs for export / publication plots.")
+            poses = dual_radar_layout(radar_sep, r_max, blind_zone_m, scan_limit_deg)
+            pose_r1, pose_r2 = poses[0], poses[1]
+
+            # Draw Layers
+            
+            # Layer 1: Shadows (Explicitly Calculated)
+            if r1_active:
+                 # R1 Shadow (Part > Sep)
+                 sx1, sy1 = radar_wedge_polygon(pose_r1, "shadow", wedge_pts)
+                 fig_pass.add_trace(go.Scatter(x=sx1, y=sy1, fill='toself', mode='none', 
+                    name=f"Shadow/Blocked ({area_blocked:.1f} m²)", 
+                    fillcolor='rgba(128, 128, 128, 0.4)', showlegend=True, hoverinfo='skip'))
+
+            if r2_active:
+                 # R2 Shadow (Part < 0)
+                 sx2, sy2 = radar_wedge_polygon(pose_r2, "shadow", wedge_pts)
+                 # Legend handled by R1 trace usually
+                 show_leg = True if not r1_active else False
+                 fig_pass.add_trace(go.Scatter(x=sx2, y=sy2, fill='toself', mode='none', 
+                    name=f"Shadow/Blocked ({area_blocked:.1f} m²)", 
+                    fillcolor='rgba(128, 128, 128, 0.4)', showlegend=show_leg, hoverinfo='skip'))
+
+            # Layer 2: Usable Coverage
+            if r1_active:
+                vx1, vy1 = radar_wedge_polygon(pose_r1, "valid", wedge_pts)
+                fig_pass.add_trace(go.Scatter(x=vx1, y=vy1, fill='toself', mode='lines', 
+                    name=f"Radar 1 Only ({area_r1_only:.1f} m²)", 
+                    line=dict(color='blue', width=1), fillcolor='rgba(0, 0, 255, 0.3)', hoverinfo='skip'))
+                fig_pass.add_trace(go.Scatter(x=[0], y=[-2], mode='text', text=['RADAR 1'], textfont=dict(size=14, color='black'), showlegend=False))
+
+            if r2_active:
+                vx2, vy2 = radar_wedge_polygon(pose_r2, "valid", wedge_pts)
+                fig_pass.add_trace(go.Scatter(x=vx2, y=vy2, fill='toself', mode='lines', 
+                    name=f"Radar 2 Only ({area_r2_only:.1f} m²)", 
+                    line=dict(color='red', width=1), fillcolor='rgba(255, 0, 0, 0.3)', hoverinfo='skip'))
+                fig_pass.add_trace(go.Scatter(x=[0], y=[radar_sep + 2], mode='text', text=['RADAR 2'], textfont=dict(size=14, color='black'), showlegend=False))
+
+            # Layer 3: Intersection Marker (Dummy for Legend)
+            if r1_active and r2_active:
+                 fig_pass.add_trace(go.Scatter(x=[None], y=[None], mode='markers', 
+                    marker=dict(size=10, color='purple', opacity=0.5),
+                    name=f"Dual Coverage ({area_intersect:.1f} m²)", showlegend=True))
+
+            # Layer 4: Blind Zones (Implicitly circular at origin, always 'valid' in geometric sense relative to radar)
+            # Note: Blind Zone metric is strictly near-field.
+            if r1_active and blind_zone_m > 0:
+                 bx1, by1 = radar_wedge_polygon(pose_r1, "blind", wedge_pts)
+                 fig_pass.add_trace(go.Scatter(x=bx1, y=by1, fill='toself', mode='lines', 
+                    name=f"Blind Zone ({total_blind_area_dual:.1f} m²)", 
+                    line=dict(color='rgb(50,50,50)', width=1), fillcolor='rgba(50,50,50,0.8)', hoverinfo='skip'))
+
+            if r2_active and blind_zone_m > 0:
+                 bx2, by2 = radar_wedge_polygon(pose_r2, "blind", wedge_pts)
+                 show_leg_blind = True if (not r1_active) else False
+                 fig_pass.add_trace(go.Scatter(x=bx2, y=by2, fill='toself', mode='lines', 
+                    name=f"Blind Zone ({total_blind_area_dual:.1f} m²)", 
+                    line=dict(color='rgb(50,50,50)', width=1), fillcolor='rgba(50,50,50,0.8)', showlegend=show_leg_blind, hoverinfo='skip'))
 
         # Layer 5: Measurement Ruler (Smart Visualization - Rev 3.29)
         if show_ruler:
@@ -1308,8 +1538,276 @@ elif selected_tool == "RADAR Calculator":
             dragmode='pan',
             legend=dict(x=1.02, y=1, xanchor='left', yanchor='top', bgcolor='rgba(255,255,255,0.5)')
         )
+        if pass_view is not None:
+            fig_pass.update_xaxes(range=[pass_view[0], pass_view[2]])
+            fig_pass.update_yaxes(range=[pass_view[1], pass_view[3]])
         st.plotly_chart(fig_pass, use_container_width=True)
 
+        # --- SNR / Detection Coverage (Rev 3.38) ---
+        with st.expander("📶 SNR & Detection Probability Heatmap", expanded=False):
+            st.caption("Radar equation evaluated per cell of the arena (Power Budget Calculator terms). "
+                       "The antenna pattern losses are replaced by a cos^q element pattern over azimuth.")
+            col_sn1, col_sn2, col_sn3 = st.columns(3)
+            with col_sn1:
+                sn_pt_dbm = st.number_input("Transmit Power P_t (dBm)", value=10.4, step=0.1, key="sn_pt")
+                sn_g_db = st.number_input("Element Gain G_elm (dB)", value=5.5, step=0.1, key="sn_g")
+                sn_hpbw = st.number_input("Element HPBW (deg)", value=120.0, min_value=10.0, max_value=170.0, step=5.0, key="sn_hpbw")
+            with col_sn2:
+                sn_sigma = st.number_input("Target RCS σ (dBsm)", value=-12.6, step=1.0, key="sn_sigma")
+                sn_ntx = st.number_input("N_Tx", value=324, min_value=1, step=1, key="sn_ntx")
+                sn_nrx = st.number_input("N_Rx", value=528, min_value=1, step=1, key="sn_nrx")
+            with col_sn3:
+                sn_nf = st.number_input("Noise Figure NF (dB)", value=15.0, step=0.1, key="sn_nf")
+                sn_wbb_khz = st.number_input("Receiver Bandwidth W_BB (kHz)", value=50.0, min_value=0.1, step=10.0, key="sn_wbb")
+                sn_loss = st.number_input("Other Losses (dB)", value=9.5, step=0.5, key="sn_loss",
+                                          help="Loss table total without the Tx/Rx antenna pattern rows.")
+
+            col_sn4, col_sn5, col_sn6 = st.columns(3)
+            with col_sn4:
+                sn_pfa = st.select_slider("P_fa", options=[1e-3, 1e-4, 1e-5, 1e-6, 1e-7, 1e-8], value=1e-6, key="sn_pfa")
+            with col_sn5:
+                sn_pd_min = st.slider("Required P_d", 0.5, 0.99, 0.9, 0.01, key="sn_pd_min")
+            with col_sn6:
+                sn_grid = st.select_slider("Grid Resolution (m)", options=[0.5, 0.25, 0.1], value=0.25, key="sn_grid")
+
+            sn_k_db = calculate_link_constant(sn_pt_dbm, sn_g_db, c_speed / fc_dp, sn_sigma, sn_ntx, sn_nrx,
+                                              300.0 * 10 ** (sn_nf / 10.0), sn_wbb_khz * 1e3, sn_loss)
+            sn_radars = dual_radar_layout(radar_sep, r_max, blind_zone_m, scan_limit_deg, r1_active, r2_active)
+            # Computed on request, so other widgets on the page rerun without the raster
+            if sn_radars and st.checkbox("Compute SNR Heatmap", value=False, key="sn_run"):
+                sn = calculate_snr_coverage(sn_radars, sn_k_db, sn_grid, pattern_exponent=element_pattern_exponent(sn_hpbw),
+                                            pfa=sn_pfa, pd_min=sn_pd_min)
+
+                c_sn1, c_sn2, c_sn3 = st.columns(3)
+                c_sn1.metric("Geometric Coverage", f"{sn['area_geometric']:.1f} m²")
+                c_sn2.metric(f"Usable (P_d ≥ {sn_pd_min:.2f})", f"{sn['area_detect']:.1f} m²")
+                c_sn3.metric("Required SNR", f"{sn['snr_required_db']:.1f} dB")
+
+                sn_view = st.radio("Show", ["SNR (dB)", "Detection Probability"], horizontal=True, key="sn_view")
+                if sn_view == "SNR (dB)":
+                    z, zmin, zmax, cbar = sn["snr_db"], sn["snr_required_db"] - 20, np.nanmax(sn["snr_db"]), "SNR (dB)"
+                else:
+                    z, zmin, zmax, cbar = np.where(np.isnan(sn["snr_db"]), np.nan, sn["pd"]), 0.0, 1.0, "P_d"
+                fig_sn = go.Figure(go.Heatmap(z=z, x=sn["x_grid"], y=sn["y_grid"], zmin=zmin, zmax=zmax,
+                                              colorscale="Viridis", colorbar=dict(title=cbar), hoverongaps=False))
+                fig_sn.update_layout(xaxis_title="X (m)", yaxis_title="Y (m)", height=600,
+                                     yaxis=dict(scaleanchor="x", scaleratio=1))
+                st.plotly_chart(fig_sn, use_container_width=True)
+            elif not sn_radars:
+                st.info("Activate at least one radar.")
+
+        # --- Obstacle Occlusion (Rev 3.39) ---
+        with st.expander("🧱 Obstacles (Pillars, Walls, Equipment)", expanded=False):
+            st.caption("CSV with columns `obstacle, x, y` (one row per vertex, meters, passage-map coordinates). "
+                       "Two-vertex obstacles are walls. Shadows are found by ray casting every cell against all obstacle edges.")
+            ob_file = st.file_uploader("Upload Obstacle CSV", type=["csv", "txt"], key="ob_file")
+            ob_default = "obstacle,x,y\npillar,-3,9\npillar,-2,9\npillar,-2,10\npillar,-3,10\nwall,4,5\nwall,8,5\n"
+            if ob_file is not None:
+                ob_text = ob_file.getvalue().decode("utf-8", errors="replace")
+            else:
+                ob_text = st.text_area("Obstacle Vertices", value=ob_default, height=160, key="ob_text")
+            ob_grid = st.select_slider("Grid Resolution (m)", options=[0.5, 0.25, 0.1], value=0.1, key="ob_grid")
+
+            try:
+                obstacles = parse_obstacles(ob_text)
+            except ValueError as e:
+                st.error(str(e))
+                obstacles = ()
+
+            ob_radars = dual_radar_layout(radar_sep, r_max, blind_zone_m, scan_limit_deg, r1_active, r2_active)
+            # Computed on request, so other widgets on the page rerun without the rasters
+            if ob_radars and st.checkbox("Compute Obstacle Shadows", value=False, key="ob_run"):
+                ob_bounds = coverage_bounds(ob_radars)
+                ob_base = calculate_multi_coverage(ob_radars, ob_grid, bounds=ob_bounds)
+                ob_res = calculate_obstacle_coverage(ob_radars, obstacles, ob_grid, bounds=ob_bounds, return_raster=True)
+
+                c_ob1, c_ob2, c_ob3 = st.columns(3)
+                c_ob1.metric("Coverage (No Obstacles)", f"{ob_base['area_union']:.1f} m²")
+                c_ob2.metric("Coverage (With Obstacles)", f"{ob_res['area_union']:.1f} m²",
+                             delta=f"{ob_res['area_union'] - ob_base['area_union']:.1f} m²")
+                c_ob3.metric("Obstacle Shadow", f"{ob_res['area_blocked_union'] - ob_base['area_blocked_union']:.1f} m²",
+                             help="Extra blocked area caused by the obstacles (any radar)")
+
+                fig_ob = go.Figure(go.Heatmap(
+                    z=np.where(ob_res["coverage_count"] > 0, ob_res["coverage_count"], np.nan),
+                    x=ob_res["x_grid"], y=ob_res["y_grid"], colorscale=[[0, "rgba(0,0,255,0.35)"], [1, "rgba(128,0,128,0.7)"]],
+                    zmin=1, zmax=max(len(ob_radars), 2), colorbar=dict(title="Radars"), hoverongaps=False))
+                for i, pts in enumerate(obstacles):
+                    xs, ys = zip(*(pts + pts[:1] if len(pts) > 2 else pts))
+                    fig_ob.add_trace(go.Scatter(x=xs, y=ys, mode='lines', fill='toself' if len(pts) > 2 else None,
+                                                line=dict(color='black', width=3), fillcolor='rgba(0,0,0,0.6)',
+                                                name="Obstacle", showlegend=(i == 0)))
+                fig_ob.add_trace(go.Scatter(x=[r["x"] for r in ob_radars], y=[r["y"] for r in ob_radars], mode='markers',
+                                            marker=dict(size=12, color='red', symbol='diamond'), name="Radar"))
+                fig_ob.update_layout(xaxis_title="X (m)", yaxis_title="Y (m)", height=600,
+                                     yaxis=dict(scaleanchor="x", scaleratio=1))
+                st.plotly_chart(fig_ob, use_container_width=True)
+
+                vis_stats = VISIBILITY_CACHE.stats()
+                st.caption(f"Line-of-sight cache: {vis_stats['size']}/{vis_stats['maxsize']} masks, "
+                           f"{vis_stats['hits']} hits / {vis_stats['misses']} misses")
+            elif not ob_radars:
+                st.info("Activate at least one radar.")
+
+        # --- 3D Volume Coverage (Rev 3.40) ---
+        with st.expander("🧊 3D Volume Coverage (Mounting Height & Elevation)", expanded=False):
+            st.caption("Voxel coverage with slant range, azimuth scan limit and a tilted elevation beam. "
+                       "Targets close to a high-mounted radar fall under the beam.")
+            col_v1, col_v2, col_v3 = st.columns(3)
+            with col_v1:
+                vol_h = st.number_input("Mounting Height (m)", value=2.5, min_value=0.0, step=0.1, key="vol_h")
+                vol_tilt = st.number_input("Down-Tilt (deg)", value=10.0, min_value=-45.0, max_value=90.0, step=1.0, key="vol_tilt")
+            with col_v2:
+                vol_elev = st.number_input("Elevation Scan Limit ± (deg)", value=15.0, min_value=1.0, max_value=90.0, step=1.0, key="vol_elev")
+                vol_target = st.number_input("Target Height Slice (m)", value=1.0, min_value=0.0, step=0.1, key="vol_target")
+            with col_v3:
+                vol_zmax = st.number_input("Volume Height (m)", value=3.0, min_value=0.5, max_value=10.0, step=0.5, key="vol_zmax")
+                vol_grid = st.select_slider("Voxel Size (m)", options=[0.5, 0.25, 0.1], value=0.25, key="vol_grid")
+
+            vol_radars = dual_radar_layout(radar_sep, r_max, blind_zone_m, scan_limit_deg, r1_active, r2_active,
+                                           height=vol_h, tilt_deg=vol_tilt, elev_scan_deg=vol_elev)
+            # Computed on request, so other widgets on the page rerun without the voxel slabs
+            if vol_radars and st.checkbox("Compute Volume Coverage", value=False, key="vol_run"):
+                vol = calculate_volume_coverage(vol_radars, vol_grid, vol_zmax, vol_grid, vol_target)
+                flat_union = calculate_multi_coverage(vol_radars, vol_grid)["area_union"]
+
+                c_v1, c_v2, c_v3, c_v4 = st.columns(4)
+                c_v1.metric("Covered Volume", f"{vol['volume_union']:.1f} m³")
+                c_v2.metric(f"Coverage @ {vol_target:.1f} m", f"{vol['target_area_k'][1]:.1f} m²",
+                            delta=f"{vol['target_area_k'][1] - flat_union:.1f} m² vs 2D")
+                c_v3.metric(f"Dual @ {vol_target:.1f} m", f"{vol['target_area_k'][2]:.1f} m²" if len(vol_radars) > 1 else "—")
+                c_v4.metric("Dual Volume", f"{vol['volume_k'][2]:.1f} m³" if len(vol_radars) > 1 else "—")
+
+                col_vp1, col_vp2 = st.columns([2, 1])
+                with col_vp1:
+                    fig_vol = go.Figure(go.Heatmap(
+                        z=np.where(vol["target_count"] > 0, vol["target_count"], np.nan),
+                        x=vol["x_grid"], y=vol["y_grid"], colorscale=[[0, "rgba(0,0,255,0.35)"], [1, "rgba(128,0,128,0.7)"]],
+                        zmin=1, zmax=max(len(vol_radars), 2), colorbar=dict(title="Radars"), hoverongaps=False))
+                    fig_vol.update_layout(title=f"Slice @ {vol_target:.1f} m", xaxis_title="X (m)", yaxis_title="Y (m)",
+                                          height=550, yaxis=dict(scaleanchor="x", scaleratio=1))
+                    st.plotly_chart(fig_vol, use_container_width=True)
+                with col_vp2:
+                    fig_prof = go.Figure(go.Scatter(x=vol["area_union_by_z"], y=vol["z_levels"], mode='lines+markers', name="Union"))
+                    if len(vol_radars) > 1:
+                        fig_prof.add_trace(go.Scatter(x=vol["area_k_by_z"][:, 2], y=vol["z_levels"], mode='lines+markers', name="Dual"))
+                    fig_prof.add_hline(y=vol_h, line_dash="dash", annotation_text="Radar")
+                    fig_prof.update_layout(title="Covered Area vs Height", xaxis_title="Area (m²)", yaxis_title="Height (m)", height=550)
+                    st.plotly_chart(fig_prof, use_container_width=True)
+            elif not vol_radars:
+                st.info("Activate at least one radar.")
+
+        # --- Trajectory Monte Carlo (Rev 3.41) ---
+        with st.expander("🚶 Passage Crossing Monte Carlo (Dwell Time)", expanded=False):
+            st.caption("Simulates people walking through the passage and measures how long each one stays in single / dual coverage. "
+                       "A crossing counts as missed when its dwell time is below the minimum.")
+            col_mc1, col_mc2, col_mc3 = st.columns(3)
+            with col_mc1:
+                mc_dir = st.radio("Walking Direction", ["Across (X)", "Along (Radar 1 → Radar 2)"], key="mc_dir")
+                mc_lanes = st.number_input("Number of Lanes", value=5, min_value=1, max_value=20, step=1, key="mc_lanes")
+            with col_mc2:
+                mc_n = st.select_slider("Walkers per Lane", options=[1000, 2000, 5000, 10000, 20000], value=2000, key="mc_n")
+                mc_speed = st.number_input("Walking Speed (m/s)", value=1.4, min_value=0.1, step=0.1, key="mc_speed")
+                mc_speed_std = st.number_input("Speed Std Dev (m/s)", value=0.3, min_value=0.0, step=0.05, key="mc_speed_std")
+            with col_mc3:
+                mc_heading = st.number_input("Heading Noise (deg/√s)", value=0.0, min_value=0.0, step=1.0, key="mc_heading",
+                                             help="0 = straight paths, > 0 = random walk")
+                mc_min_dwell = st.number_input("Min Dwell for Detection (s)", value=0.5, min_value=0.0, step=0.1, key="mc_min_dwell")
+                mc_seed = st.number_input("Seed", value=0, min_value=0, step=1, key="mc_seed")
+
+            mc_radars = dual_radar_layout(radar_sep, r_max, blind_zone_m, scan_limit_deg, r1_active, r2_active)
+            if mc_radars and st.checkbox("Run Simulation", value=False, key="mc_run"):
+                mc_lane_list = passage_lanes(radar_sep, r_max, n_lanes=int(mc_lanes),
+                                             direction="across" if mc_dir.startswith("Across") else "along")
+                mc_res = simulate_trajectories(mc_radars, mc_lane_list, n_per_lane=int(mc_n), speed_mean=mc_speed,
+                                               speed_std=mc_speed_std, heading_std_deg=mc_heading,
+                                               min_dwell=mc_min_dwell, seed=int(mc_seed))
+
+                st.dataframe(pd.DataFrame([{
+                    "Lane": r["lane"]["name"],
+                    "Median Dwell (s)": round(float(r["dwell_any_median"]), 2),
+                    "P10 Dwell (s)": round(float(r["dwell_any_p10"]), 2),
+                    "Median Dual Dwell (s)": round(float(r["dwell_dual_median"]), 2),
+                    "P_miss (any)": f"{r['miss_probability'] * 100:.2f}%",
+                    "P_miss (dual)": f"{r['dual_miss_probability'] * 100:.2f}%",
+                } for r in mc_res]), use_container_width=True, hide_index=True)
+
+                mc_kind = st.radio("Histogram", ["Any Coverage", "Dual Coverage", "Single Only"], horizontal=True, key="mc_kind")
+                mc_key = {"Any Coverage": "dwell_any", "Dual Coverage": "dwell_dual", "Single Only": "dwell_single"}[mc_kind]
+                fig_mc = go.Figure()
+                for r in mc_res:
+                    fig_mc.add_trace(go.Histogram(x=r[mc_key], name=r["lane"]["name"], opacity=0.6, nbinsx=60))
+                fig_mc.add_vline(x=mc_min_dwell, line_dash="dash", annotation_text="Min dwell")
+                fig_mc.update_layout(barmode="overlay", xaxis_title="Dwell Time (s)", yaxis_title="Walkers", height=450)
+                st.plotly_chart(fig_mc, use_container_width=True)
+
+        # --- Multi-Target Tracking (Rev 3.42) ---
+        with st.expander("🎯 Multi-Target Tracking (Kalman + GNN)", expanded=False):
+            st.caption("Targets walk through the passage; detections exist only inside the dual-radar coverage. "
+                       "A constant-velocity Kalman tracker with gated nearest-neighbour association shows how coverage gaps break tracks.")
+            col_tk1, col_tk2, col_tk3 = st.columns(3)
+            with col_tk1:
+                tk_targets = st.number_input("Targets", value=20, min_value=1, max_value=5000, step=10, key="tk_targets")
+                tk_frames = st.number_input("Frames", value=200, min_value=10, max_value=2000, step=50, key="tk_frames")
+            with col_tk2:
+                tk_dt_ms = st.number_input("Frame Period (ms)", value=50.0, min_value=1.0, step=5.0, key="tk_dt")
+                tk_pd = st.slider("Detection Probability", 0.5, 1.0, 0.9, 0.01, key="tk_pd")
+                tk_clutter = st.number_input("False Alarms per Frame", value=2.0, min_value=0.0, step=0.5, key="tk_clutter")
+            with col_tk3:
+                tk_meas = st.number_input("Measurement Std (m)", value=0.15, min_value=0.01, step=0.01, key="tk_meas")
+                tk_confirm = st.number_input("Confirm After (hits)", value=3, min_value=1, step=1, key="tk_confirm")
+                tk_misses = st.number_input("Delete After (misses)", value=5, min_value=1, step=1, key="tk_misses")
+
+            tk_radars = dual_radar_layout(radar_sep, r_max, blind_zone_m, scan_limit_deg, r1_active, r2_active)
+            if tk_radars and st.checkbox("Run Tracking Simulation", value=False, key="tk_run"):
+                tk_half = r_max * math.sin(math.radians(min(scan_limit_deg, 89.0)))
+                tk = run_tracking_scenario(tk_radars, int(tk_targets), int(tk_frames), tk_dt_ms / 1000.0,
+                                           (-tk_half, 0.0, tk_half, radar_sep), pd=tk_pd, meas_std=tk_meas,
+                                           clutter_per_frame=tk_clutter, confirm_hits=int(tk_confirm),
+                                           max_misses=int(tk_misses), seed=0)
+                c_tk1, c_tk2, c_tk3, c_tk4 = st.columns(4)
+                c_tk1.metric("Track Continuity", f"{tk['track_continuity'] * 100:.1f}%",
+                             help="Covered target-frames held by a confirmed track")
+                c_tk2.metric("Fragmentation", f"{tk['fragmentation']:.2f}", help="Confirmed track ids per target (1 = unbroken)")
+                c_tk3.metric("False Tracks", f"{tk['false_tracks']}")
+                c_tk4.metric("Tracker Time / Frame", f"{tk['frame_time_mean'] * 1e3:.2f} ms",
+                             delta=f"max {tk['frame_time_max'] * 1e3:.1f} ms", delta_color="off")
+
+        # --- Coverage Raster Export (Rev 3.43) ---
+        with st.expander("💾 Coverage Class Raster Export (Site Planning)", expanded=False):
+            st.caption("Per-cell class raster (0 none, 1 R1-only, 2 R2-only, 3 both, 4 blocked, 5 blind, 255 padding) "
+                       "as uint8 tiles in a flat .bin file plus a JSON header. Reopen zero-copy with `np.memmap` "
+                       "(see `coverage_export.open_coverage_raster`).")
+            col_ex1, col_ex2 = st.columns(2)
+            with col_ex1:
+                ex_res = st.select_slider("Cell Size (m)", options=[0.2, 0.1, 0.05, 0.02], value=0.05, key="ex_res")
+            with col_ex2:
+                ex_tile = st.select_slider("Tile Size (cells)", options=[256, 512, 1024, 2048], value=1024, key="ex_tile")
+            ex_margin = r_max + 5.0
+            ex_cells = int(round(2 * ex_margin / ex_res)) * int(round((radar_sep + 2 * ex_margin) / ex_res))
+            st.write(f"Raster: **{ex_cells / 1e6:.1f} M cells** (~{ex_cells / 1e6:.1f} MB + tile padding)")
+
+            if st.button("Generate Export", key="ex_go"):
+                with tempfile.TemporaryDirectory() as ex_dir:
+                    ex_path = os.path.join(ex_dir, "coverage_classes")
+                    export_dual_coverage_classes(ex_path, r1_active, r2_active, radar_sep, r_max, blind_zone_m,
+                                                 scan_limit_deg, ex_res, tile_size=ex_tile)
+                    ex_hdr, ex_tiles = open_coverage_raster(ex_path + ".json")
+                    ex_areas = class_areas(ex_hdr, ex_tiles)
+                    del ex_tiles
+                    ex_buf = io.BytesIO()
+                    with zipfile.ZipFile(ex_buf, "w", zipfile.ZIP_DEFLATED) as zf:
+                        zf.write(ex_path + ".json", "coverage_classes.json")
+                        zf.write(ex_path + ".bin", "coverage_classes.bin")
+                st.session_state["ex_zip"] = ex_buf.getvalue()
+                st.session_state["ex_areas"] = ex_areas
+
+            if "ex_zip" in st.session_state:
+                st.dataframe(pd.DataFrame([{"Class": k, "Area (m²)": round(float(v), 2)}
+                                           for k, v in st.session_state["ex_areas"].items()]), hide_index=True)
+                st.download_button("Download Raster (.zip)", st.session_state["ex_zip"],
+                                   file_name="coverage_classes.zip", mime="application/zip", key="ex_dl")
+
 
 
     elif radar_tool == "RCS Calculator (Target Modeling)":
@@ -1543,10 +2041,12 @@ elif selected_tool == "RADAR Calculator":
             c_sim1, c_sim2, c_sim3 = st.columns(3)
             with c_sim1:
                 window_type = st.selectbox("Windowing", ["None", "Hamming", "Hanning", "Blackman"])
+                af_solver = st.selectbox("AF Solver", ["FFT (u-space)", "Direct Sum (complex128)", "Direct Sum (complex64)"],
+                                         key="af_solver", help="Direct Sum evaluates every element in angle blocks under a 100 MB cap (Rev 3.47)")
             with c_sim2:
                 sim_res = st.number_input("Resolution (deg)", value=0.01, min_value=0.01, max_value=1.0, step=0.01, format="%.3f", help="Simulation angular step")
             with c_sim3:
-                sim_mode = st.radio("View Mode", ["Physical Geometry", "Beam Pattern (Azimuth)", "Beam Pattern (Elevation)"], horizontal=True)
+                sim_mode = st.radio("View Mode", ["Physical Geometry", "Beam Pattern (Azimuth)", "Beam Pattern (Elevation)", "Virtual Array 2D (u,v)"], horizontal=True)
 
             # 3. Array Configuration (Hidden by default)
             with st.expander("Hardware Setup (Array Configuration)", expanded=False):
@@ -1573,39 +2073,25 @@ elif selected_tool == "RADAR Calculator":
             k = 2 * np.pi / wavelength
             
             # Helper: Steered AF (Numeric Solver)
-            def solve_array_factor(n_elems, spacing_m, w_name, scan_angle_deg, res_deg):
-                # 1. Setup
-                theta_scan_rad = np.radians(scan_angle_deg)
-                
-                # Windowing Weights
-                if w_name == "Hamming":
-                    weights = np.hamming(n_elems)
-                elif w_name == "Hanning":
-                    weights = np.hanning(n_elems)
-                elif w_name == "Blackman":
-                    weights = np.blackman(n_elems)
-                else:
-                    weights = np.ones(n_elems)
+            def solve_array_factor(n_elems, spacing_m, w_name, scan_angle_deg, res_deg, solver="FFT (u-space)"):
+                # 1. Setup: Windowing Weights
+                weights = array_weights(n_elems, w_name)
                 
                 # 2. Angle Vector (High Res)
                 # Ensure we cover -90 to 90
                 theta_deg = np.arange(-90, 90 + res_deg/2, res_deg)
-                theta_rad = np.radians(theta_deg)
                 
                 # 3. Calculation: AF = sum( w_n * exp(j * k * n * d * (sin(th) - sin(th_scan))) )
-                n_idx = np.arange(n_elems)
-                
-                # Vectorized
-                # u = sin(Theta) - sin(Theta_scan)
-                u = np.sin(theta_rad) - np.sin(theta_scan_rad)
-                
-                # phases [N, Theta] = k * d * n * u
-                # To broadcast: n_idx[:, None] * u[None, :]
-                phases = k * spacing_m * n_idx[:, np.newaxis] * u[np.newaxis, :]
-                
-                # Sum over N
-                af_complex = np.sum(weights[:, np.newaxis] * np.exp(1j * phases), axis=0)
-                af_mag = np.abs(af_complex)
+                # Uniform spacing -> Dirichlet kernel (no window) or zero-padded FFT in u-space,
+                # no N x Theta phase matrix (Rev 3.45).
+                # The u-space pattern is steering-invariant: cached once, shifted by sin(theta_scan) (Rev 3.46)
+                if solver.startswith("Direct"):
+                    # Element-by-element sum, blockwise under a memory cap (Rev 3.47)
+                    af_dtype = np.complex64 if "complex64" in solver else np.complex128
+                    af_mag = np.abs(direct_array_factor(np.arange(n_elems) * spacing_m, weights, wavelength,
+                                                        scan_angle_deg, theta_deg, dtype=af_dtype, mem_budget_mb=100))
+                else:
+                    af_mag = steered_array_factor(n_elems, spacing_m, w_name, wavelength, scan_angle_deg, theta_deg)
                 
                 # Normalize (Peak = 0 dB)
                 peak_val = np.max(af_mag)
@@ -1623,41 +2109,22 @@ elif selected_tool == "RADAR Calculator":
                 main_beam_gain_lin = np.sum(weights)
                 main_beam_gain_db = 20 * np.log10(main_beam_gain_lin) if main_beam_gain_lin > 0 else 0
                 
-                # 4. Numeric Resolution Solver
-                # Find index of max
-                idx_max = np.argmax(af_mag)
-                peak_angle = theta_deg[idx_max]
-                
-                # Find -3dB points (or exactly 1/sqrt(2) points)
-                # Threshold = Peak_Linear / sqrt(2)
-                # In dB, this is 20*log10(1/sqrt(2)) ~= -3.01 dB
-                target_level = 1.0 / np.sqrt(2.0)
-                
-                # Search Right
-                idx_right = idx_max
-                for i in range(idx_max, len(af_norm)):
-                    if af_norm[i] < target_level:
-                        idx_right = i
-                        break
-                angle_right = theta_deg[idx_right]
-                
-                # Search Left
-                idx_left = idx_max
-                for i in range(idx_max, -1, -1):
-                    if af_norm[i] < target_level:
-                        idx_left = i
-                        break
-                angle_left = theta_deg[idx_left]
-
-                # Exact interpolation could be better, but grid search with sim_res is sufficient if sim_res is small.
-                resolution = abs(angle_right - angle_left)
+                # 4. Beam Metrics (Rev 3.48)
+                # Solved in u-space at 16 samples per lambda/L with interpolated crossings,
+                # so the -3 dB width no longer depends on the angular grid (sim_res).
+                # Always from the cached FFT pattern: the layout is uniform, so a Direct solver would give the
+                # same samples at the cost of a second full sum; it only drives the plotted curve
+                u_vis, af_u = visible_u_pattern(n_elems, spacing_m, w_name, wavelength, scan_angle_deg)
+                metrics = pattern_metrics(u_vis, af_u, scan_angle_deg, grating_lobe_u(spacing_m, wavelength, scan_angle_deg))
+                resolution = metrics["hpbw_deg"]
                 
                 return {
                     "theta": theta_deg,
                     "af_db": af_db,
                     "resolution": resolution,
                     "gain_db": main_beam_gain_db,
-                    "weights": weights
+                    "weights": weights,
+                    "metrics": metrics
                 }
 
             # --- Logic Branching ---
@@ -1693,6 +2160,12 @@ elif selected_tool == "RADAR Calculator":
                 st.info(f"**Total AWR2243 Chips:** {total_chips} ({rx_chips} RX + {tx_chips} TX)")
             with c_inv3:
                 st.info(f"**Total Antennas:** {rx_total_elems + tx_total_elems} ({rx_total_elems} RX + {tx_total_elems} TX)")
+            
+            # Virtual array (Rev 3.50): deduplicated TX/RX pair positions as integer lattice offsets
+            t_va = cached_t_shape_virtual_array(rx_total_elems, tx_total_elems, window_type)
+            st.caption(f"Virtual array: {len(t_va['ix']):,} unique elements from {t_va['n_pairs']:,} TX/RX pairs "
+                       f"(max multiplicity {int(t_va['multiplicity'].max())}), stored as {t_va['ix'].dtype} offsets in "
+                       f"{t_va['nbytes'] / 2**20:.1f} MB vs {t_va['n_pairs'] * 16 / 2**20:.1f} MB as float64 (x, y)")
 
             # --- Visualization ---
             
@@ -1778,6 +2251,52 @@ elif selected_tool == "RADAR Calculator":
                                   xaxis=dict(autorange=True)) # Ensure auto range
                 st.plotly_chart(fig, use_container_width=True)
 
+            elif sim_mode == "Virtual Array 2D (u,v)":
+                # --- Virtual Array 2D Pattern (Rev 3.49) ---
+                st.subheader("Virtual Array 2D Pattern (u, v)")
+                st.caption("Every TX/RX pair forms a virtual element at x_RX + y_TX. The full (u, v) pattern of the "
+                           "virtual aperture comes from one zero-padded 2D FFT; the steering angle (azimuth) only shifts it.")
+                
+                vv = get_virtual_view(rx_total_elems, tx_total_elems, d_rx_m, d_tx_m, window_type, wavelength,
+                                      float(np.sin(np.radians(theta_scan))))
+                pm = vv["metrics"]
+                
+                fig_uv = go.Figure(go.Heatmap(
+                    x=vv["u"], y=vv["v"], z=vv["db"], zmin=-60, zmax=0, colorscale="Viridis",
+                    colorbar=dict(title="dB"),
+                    hovertemplate='u: %{x:.3f}<br>v: %{y:.3f}<br>%{z:.1f} dB<extra></extra>'
+                ))
+                circ = np.linspace(0, 2 * np.pi, 361)
+                fig_uv.add_trace(go.Scatter(x=np.cos(circ), y=np.sin(circ), mode='lines',
+                                            line=dict(color='white', width=1), name='Visible Region', hoverinfo='skip'))
+                fig_uv.update_layout(
+                    title=f"Virtual Array Pattern ({vv['n_virtual']:,} elements, {vv['shape'][1]} x {vv['shape'][0]} visible samples)",
+                    xaxis_title="u = sin(az) cos(el)", yaxis_title="v = sin(el)",
+                    yaxis=dict(scaleanchor="x", scaleratio=1, range=[-1.05, 1.05]), xaxis=dict(range=[-1.05, 1.05]),
+                    height=650, showlegend=False
+                )
+                st.plotly_chart(fig_uv, use_container_width=True)
+                
+                v1, v2, v3, v4 = st.columns(4)
+                v1.metric("Beam Direction (Az / El)", f"{pm['peak_az_deg']:.2f}° / {pm['peak_el_deg']:.2f}°")
+                v2.metric("-3 dB Width (Az x El)", f"{pm['hpbw_az_deg']:.3f}° x {pm['hpbw_el_deg']:.3f}°")
+                v3.metric("Directivity", f"{pm['directivity_dbi']:.1f} dBi",
+                          help=f"Beam solid angle {pm['beam_solid_angle_deg2']:.4f} deg²")
+                v4.metric("2D PSLR", f"{pm['pslr_db']:.1f} dB", help="Highest lobe outside the first-null boxes around the main lobe and grating lobes")
+                v5, v6, v7, v8 = st.columns(4)
+                v5.metric("First-Null Width (Az x El)", f"{pm['fnbw_az_deg']:.3f}° x {pm['fnbw_el_deg']:.3f}°")
+                v6.metric("Virtual Aperture", f"{(rx_total_elems - 1) * d_rx_m:.2f} m x {(tx_total_elems - 1) * d_tx_m:.2f} m")
+                if pm["n_grating_lobes"]:
+                    v7.error(f"{pm['n_grating_lobes']} Grating Lobes in visible space")
+                    v8.metric("Grating Lobe Level", format_lobe_level(pm['gl_level_db']))
+                else:
+                    v7.metric("Grating Lobes", "None")
+                
+                gl_stats, sv_stats = PLANAR_CACHE.stats(), STEERED_CACHE.stats()
+                st.caption(f"Virtual pattern cache: {gl_stats['size']}/{gl_stats['maxsize']} patterns, "
+                           f"{gl_stats['hits']} hits / {gl_stats['misses']} misses; steered views "
+                           f"{sv_stats['size']}/{sv_stats['maxsize']}, {sv_stats['hits']} hits / {sv_stats['misses']} misses")
+
             else: # Beam Pattern Mode
                 # Identify Configuration
                 is_azimuth = "Azimuth" in sim_mode
@@ -1786,7 +2305,7 @@ elif selected_tool == "RADAR Calculator":
                 d = d_rx_m if is_azimuth else d_tx_m
                 
                 # 1. Real Solver
-                res_real = solve_array_factor(N, d, window_type, theta_scan, sim_res)
+                res_real = solve_array_factor(N, d, window_type, theta_scan, sim_res, af_solver)
                 
                 # 2. Theoretical Solver (Virtual Array)
                 # N=1000, Same Length L
@@ -1794,7 +2313,7 @@ elif selected_tool == "RADAR Calculator":
                 N_theory = 1000
                 d_theory = L_real / (N_theory - 1) if N_theory > 1 else L_real
                 
-                res_theory = solve_array_factor(N_theory, d_theory, window_type, theta_scan, sim_res)
+                res_theory = solve_array_factor(N_theory, d_theory, window_type, theta_scan, sim_res, af_solver)
                 
                 # 3. Grating Lobe Check
                 gl_angles = []
@@ -1941,7 +2460,7 @@ elif selected_tool == "RADAR Calculator":
 
                 # --- Metrics & Warnings ---
                 m1, m2, m3 = st.columns(3)
-                m1.metric("Resolution (Solved by $\sqrt{2} \cdot AF$)", f"{res_real['resolution']:.3f}°", help="From numeric solver")
+                m1.metric("Resolution (Solved by $\sqrt{2} \cdot AF$)", f"{res_real['resolution']:.3f}°", help="Interpolated -3 dB crossings of the u-space pattern")
                 
                 m2.metric("Theoretical Resolution (λ/L)", f"{res_theo_deg:.3f}°", help="Rayleigh Criterion: degrees(asin(λ/L))")
                 # Removed Peak Gain metric as requested
@@ -1949,6 +2468,19 @@ elif selected_tool == "RADAR Calculator":
                 if gl_angles:
                     m3.error(f"Warning: {len(gl_angles)} Grating Lobes Detected!")
                     st.warning(f"Grating Lobes found at: {[f'{a:.1f}°' for a in gl_angles]} inside visible field.")
+                
+                # Beam Metrics (Rev 3.48)
+                bm = res_real["metrics"]
+                b1, b2, b3, b4, b5 = st.columns(5)
+                b1.metric("-10 dB Width", f"{bm['bw10_deg']:.3f}°")
+                b2.metric("First-Null Width", f"{bm['fnbw_deg']:.3f}°")
+                b3.metric("PSLR", f"{bm['pslr_db']:.1f} dB", help="Peak sidelobe level, grating lobes excluded")
+                b4.metric("ISLR", f"{bm['islr_db']:.1f} dB", help="Integrated sidelobe / main lobe energy over u, grating lobes excluded")
+                if len(bm["gl_deg"]):
+                    b5.metric("Grating Lobe Level", format_lobe_level(float(np.max(bm['gl_level_db']))),
+                              help=", ".join(f"{a:.1f}°: {l:.1f} dB" for a, l in zip(bm["gl_deg"], bm["gl_level_db"])))
+                else:
+                    b5.metric("Grating Lobe Level", "None")
 
                 # --- Methodology & Formulas ---
                 with st.expander("Methodology & Formulas"):
@@ -1960,6 +2492,8 @@ elif selected_tool == "RADAR Calculator":
                     st.latex(r"\sqrt{2} \cdot AF(Res) = AF(\theta_{scan})")
                     st.markdown(r"""
                     Where $Res$ represents the angle at which the Amplitude Factor ($AF$) drops to $1/\sqrt{2}$ (approx 0.707) of the peak amplitude at the scan angle.
+                    
+                    The crossing is interpolated on the pattern sampled in $u = \sin\theta - \sin\theta_{scan}$ (16 samples per $\lambda/L$), so it does not depend on the display resolution.
                     """)
                     
                     st.markdown("#### Physics Formulas")
@@ -1977,6 +2511,10 @@ elif selected_tool == "RADAR Calculator":
                     else:
                         st.write("Uniform / Rectangular ($w_n = 1$)")
 
+                    pat_stats = PATTERN_CACHE.stats()
+                    st.caption(f"u-space pattern cache: {pat_stats['size']}/{pat_stats['maxsize']} patterns, "
+                               f"{pat_stats['hits']} hits / {pat_stats['misses']} misses")
+
     elif radar_tool == "Monostatic Power Budget Calculator":
         st.subheader("Monostatic Power Budget Calculator")
         st.write("General monostatic radar SNR calculation.")
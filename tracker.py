@@ -0,0 +1,284 @@
+import time
+
+import numpy as np
+
+from coverage_engine import radar_coverage_mask
+
+# 99% gate for a 2-DOF position innovation
+GATE_CHI2_99 = 9.21
+
+
+# --- Constant-Velocity Model ---
+def cv_model(dt, accel_std):
+    """State transition F and process noise Q of the [x, y, vx, vy] constant-velocity model."""
+    F = np.eye(4)
+    F[0, 2] = F[1, 3] = dt
+    # Piecewise-constant white acceleration
+    q = accel_std ** 2
+    Q = q * np.array([
+        [dt**4 / 4, 0, dt**3 / 2, 0],
+        [0, dt**4 / 4, 0, dt**3 / 2],
+        [dt**3 / 2, 0, dt**2, 0],
+        [0, dt**3 / 2, 0, dt**2],
+    ])
+    return F, Q
+
+
+# --- Track Table ---
+def init_tracker(meas_std=0.15, accel_std=1.0, init_vel_std=2.0, gate_chi2=GATE_CHI2_99,
+                 confirm_hits=3, max_misses=5, capacity=1024):
+    """Empty track table; every track attribute is one row of a stacked array."""
+    return {
+        "x": np.zeros((capacity, 4)),
+        "P": np.zeros((capacity, 4, 4)),
+        "id": np.full(capacity, -1, dtype=np.int64),
+        "hits": np.zeros(capacity, dtype=np.int32),
+        "misses": np.zeros(capacity, dtype=np.int32),
+        "alive": np.zeros(capacity, dtype=bool),
+        "next_id": 0,
+        "meas_std": meas_std,
+        "accel_std": accel_std,
+        "init_vel_std": init_vel_std,
+        "gate_chi2": gate_chi2,
+        "confirm_hits": confirm_hits,
+        "max_misses": max_misses,
+    }
+
+
+def _grow(tr, n_needed):
+    """Doubles the table until n_needed free rows exist."""
+    cap = len(tr["alive"])
+    while cap - np.count_nonzero(tr["alive"]) < n_needed:
+        cap *= 2
+    extra = cap - len(tr["alive"])
+    if extra == 0:
+        return
+    tr["x"] = np.concatenate([tr["x"], np.zeros((extra, 4))])
+    tr["P"] = np.concatenate([tr["P"], np.zeros((extra, 4, 4))])
+    tr["id"] = np.concatenate([tr["id"], np.full(extra, -1, dtype=np.int64)])
+    tr["hits"] = np.concatenate([tr["hits"], np.zeros(extra, dtype=np.int32)])
+    tr["misses"] = np.concatenate([tr["misses"], np.zeros(extra, dtype=np.int32)])
+    tr["alive"] = np.concatenate([tr["alive"], np.zeros(extra, dtype=bool)])
+
+
+# --- Association ---
+def _gated_pairs(pos, S, S_inv, z, gate_chi2):
+    """All (track, detection) pairs with Mahalanobis distance inside the gate, as sparse arrays.
+
+    The gate ellipse of a track spans +- sqrt(chi2 * S_xx) in x, so with
+    detections sorted by x each track only tests the slice found by
+    searchsorted. Candidate pairs are expanded with np.repeat; cost scales
+    with the number of nearby pairs, not tracks x detections.
+    """
+    order = np.argsort(z[:, 0])
+    zx = z[order, 0]
+    half = np.sqrt(gate_chi2 * S[:, 0, 0])
+    lo = np.searchsorted(zx, pos[:, 0] - half, side="left")
+    hi = np.searchsorted(zx, pos[:, 0] + half, side="right")
+    counts = hi - lo
+
+    ti = np.repeat(np.arange(len(pos)), counts)
+    starts = np.cumsum(counts) - counts
+    di = order[lo[ti] + np.arange(len(ti)) - starts[ti]]
+
+    e = z[di] - pos[ti]
+    Si = S_inv[ti]
+    d2 = (e[:, 0] * (Si[:, 0, 0] * e[:, 0] + Si[:, 0, 1] * e[:, 1])
+          + e[:, 1] * (Si[:, 1, 0] * e[:, 0] + Si[:, 1, 1] * e[:, 1]))
+    inside = d2 <= gate_chi2
+    return ti[inside], di[inside], d2[inside]
+
+
+def associate_gnn(ti, di, d2):
+    """Greedy global nearest-neighbour assignment on sparse gated pairs.
+
+    Repeatedly accepts every pair that is the closest option for both its
+    track and its detection (the globally closest remaining pair always
+    is), then drops pairs touching assigned rows. Equivalent to assigning
+    pairs in order of increasing distance, but vectorized per round.
+    Returns matched (track_index, detection_index) arrays.
+    """
+    order = np.argsort(d2, kind="stable")
+    ti, di = ti[order], di[order]
+    out_t, out_d = [], []
+    while len(ti):
+        # First occurrence in distance order = best option of each track / detection
+        _, best_t = np.unique(ti, return_index=True)
+        _, best_d = np.unique(di, return_index=True)
+        mutual = np.intersect1d(best_t, best_d, assume_unique=True)
+        out_t.append(ti[mutual])
+        out_d.append(di[mutual])
+        keep = ~np.isin(ti, ti[mutual]) & ~np.isin(di, di[mutual])
+        ti, di = ti[keep], di[keep]
+    if not out_t:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    return np.concatenate(out_t), np.concatenate(out_d)
+
+
+# --- Batch Predict / Update ---
+def tracker_step(tr, z, dt):
+    """Advances all tracks by dt and assimilates detections z (D, 2).
+
+    Predict and update run as batched matrix products over the stacked
+    track arrays. Unassigned detections start tentative tracks; tracks are
+    confirmed after confirm_hits updates and deleted after max_misses
+    consecutive misses. Returns per-detection track ids (-1 if none) and
+    the rows of confirmed tracks.
+    """
+    z = np.asarray(z, dtype=float).reshape(-1, 2)
+    F, Q = cv_model(dt, tr["accel_std"])
+    R = tr["meas_std"] ** 2 * np.eye(2)
+    live = np.flatnonzero(tr["alive"])
+
+    # 1. Predict
+    x = tr["x"][live] @ F.T
+    P = F @ tr["P"][live] @ F.T + Q
+
+    # 2. Gate + associate
+    S = P[:, :2, :2] + R
+    det = S[:, 0, 0] * S[:, 1, 1] - S[:, 0, 1] * S[:, 1, 0]
+    S_inv = np.stack([np.stack([S[:, 1, 1], -S[:, 0, 1]], -1),
+                      np.stack([-S[:, 1, 0], S[:, 0, 0]], -1)], -2) / det[:, None, None]
+    ti, di = associate_gnn(*_gated_pairs(x[:, :2], S, S_inv, z, tr["gate_chi2"]))
+
+    # 3. Update assigned tracks: K = P H^T S^-1 with H = [I 0]
+    K = P[ti][:, :, :2] @ S_inv[ti]                     # (M, 4, 2)
+    innov = z[di] - x[ti, :2]
+    x[ti] += np.einsum("mij,mj->mi", K, innov)
+    P[ti] -= K @ P[ti][:, :2, :]
+
+    rows = live
+    tr["x"][rows], tr["P"][rows] = x, P
+    hit = np.zeros(len(rows), dtype=bool)
+    hit[ti] = True
+    tr["hits"][rows[hit]] += 1
+    tr["misses"][rows[hit]] = 0
+    tr["misses"][rows[~hit]] += 1
+    tr["alive"][rows[tr["misses"][rows] >= tr["max_misses"]]] = False
+
+    det_track = np.full(len(z), -1, dtype=np.int64)
+    det_track[di] = tr["id"][rows[ti]]
+
+    # 4. Births from unassigned detections
+    new = np.setdiff1d(np.arange(len(z)), di)
+    if len(new):
+        _grow(tr, len(new))
+        free = np.flatnonzero(~tr["alive"])[:len(new)]
+        tr["x"][free] = 0.0
+        tr["x"][free, :2] = z[new]
+        tr["P"][free] = np.diag([R[0, 0], R[1, 1], tr["init_vel_std"] ** 2, tr["init_vel_std"] ** 2])
+        tr["id"][free] = tr["next_id"] + np.arange(len(new))
+        tr["next_id"] += len(new)
+        tr["hits"][free] = 1
+        tr["misses"][free] = 0
+        tr["alive"][free] = True
+        det_track[new] = tr["id"][free]
+
+    confirmed = np.flatnonzero(tr["alive"] & (tr["hits"] >= tr["confirm_hits"]))
+    return {"det_track": det_track, "confirmed": confirmed}
+
+
+# --- Simulated Dual-Radar Detections ---
+def simulate_detections(radars, n_targets, n_frames, dt, bounds, pd=0.9, meas_std=0.15, speed_mean=1.4,
+                        clutter_per_frame=0.0, seed=None):
+    """Yields (detections (D, 2), truth_ids (D,), truth_positions (T, 2), in_coverage (T,)) per frame.
+
+    Targets walk at constant velocity inside bounds (bouncing off the
+    edges); a target is detected with probability pd while any radar covers
+    it. Clutter is uniform over the bounds (truth id -1).
+    """
+    rng = np.random.default_rng(seed)
+    x_min, y_min, x_max, y_max = bounds
+    pos = np.column_stack([rng.uniform(x_min, x_max, n_targets), rng.uniform(y_min, y_max, n_targets)])
+    heading = rng.uniform(0, 2 * np.pi, n_targets)
+    speed = np.abs(rng.normal(speed_mean, 0.3 * speed_mean, n_targets))
+    vel = np.column_stack([speed * np.cos(heading), speed * np.sin(heading)])
+
+    for _ in range(n_frames):
+        pos += vel * dt
+        for axis, lo, hi in ((0, x_min, x_max), (1, y_min, y_max)):
+            out = (pos[:, axis] < lo) | (pos[:, axis] > hi)
+            vel[out, axis] *= -1
+            pos[:, axis] = np.clip(pos[:, axis], lo, hi)
+
+        covered = np.any(radar_coverage_mask(radars, pos[:, 0], pos[:, 1]), axis=0)
+        seen = covered & (rng.random(n_targets) < pd)
+        z = pos[seen] + rng.normal(0.0, meas_std, (np.count_nonzero(seen), 2))
+        ids = np.flatnonzero(seen)
+
+        n_clutter = rng.poisson(clutter_per_frame)
+        if n_clutter:
+            clutter = np.column_stack([rng.uniform(x_min, x_max, n_clutter), rng.uniform(y_min, y_max, n_clutter)])
+            z = np.concatenate([z, clutter])
+            ids = np.concatenate([ids, np.full(n_clutter, -1)])
+        yield z, ids, pos.copy(), covered
+
+
+def run_tracking_scenario(radars, n_targets, n_frames, dt, bounds, pd=0.9, meas_std=0.15, clutter_per_frame=0.0,
+                          accel_std=1.0, confirm_hits=3, max_misses=5, seed=None):
+    """Feeds simulated dual-radar detections through the tracker and scores continuity.
+
+    Returns mean / max frame time, the fraction of covered target-frames
+    held by a confirmed track, the mean number of confirmed track ids per
+    target (fragmentation, 1 = unbroken) and the number of confirmed tracks
+    started by clutter alone.
+    """
+    tr = init_tracker(meas_std=meas_std, accel_std=accel_std, confirm_hits=confirm_hits,
+                      max_misses=max_misses, capacity=max(1024, 2 * n_targets))
+    frame_times = []
+    held = 0
+    covered_frames = 0
+    target_tracks = [set() for _ in range(n_targets)]
+    track_truth = {}
+
+    for z, ids, _, covered in simulate_detections(radars, n_targets, n_frames, dt, bounds, pd=pd, meas_std=meas_std,
+                                                  clutter_per_frame=clutter_per_frame, seed=seed):
+        t0 = time.perf_counter()
+        out = tracker_step(tr, z, dt)
+        frame_times.append(time.perf_counter() - t0)
+
+        confirmed_ids = set(tr["id"][out["confirmed"]].tolist())
+        for tid, truth in zip(out["det_track"].tolist(), ids.tolist()):
+            if tid in confirmed_ids:
+                track_truth.setdefault(tid, set()).add(truth)
+                if truth >= 0:
+                    target_tracks[truth].add(tid)
+        held_now = {truth for tid, truth in zip(out["det_track"].tolist(), ids.tolist()) if tid in confirmed_ids and truth >= 0}
+        held += len(held_now)
+        covered_frames += int(np.count_nonzero(covered))
+
+    seen_targets = [s for s in target_tracks if s]
+    return {
+        "frame_time_mean": float(np.mean(frame_times)),
+        "frame_time_max": float(np.max(frame_times)),
+        "track_continuity": held / covered_frames if covered_frames else 0.0,
+        "fragmentation": float(np.mean([len(s) for s in seen_targets])) if seen_targets else 0.0,
+        "false_tracks": sum(1 for truths in track_truth.values() if truths == {-1}),
+        "n_tracks_started": int(tr["next_id"]),
+    }
+
+
+if __name__ == "__main__":
+    from coverage_engine import dual_radar_layout, radar_pose
+
+    print("--- Debugging Tracker ---")
+
+    # Single target, straight line: filter converges to the true velocity
+    tr = init_tracker(meas_std=0.1, accel_std=0.3)
+    rng = np.random.default_rng(0)
+    for k in range(200):
+        tracker_step(tr, np.array([[1.0 + 1.2 * 0.05 * k, 2.0 - 0.5 * 0.05 * k]]) + rng.normal(0, 0.1, 2), 0.05)
+    row = np.flatnonzero(tr["alive"])[0]
+    print(f"Velocity estimate: ({tr['x'][row, 2]:.2f}, {tr['x'][row, 3]:.2f}) m/s, expected (1.20, -0.50)")
+
+    # Dual-radar passage: tracks break where targets leave coverage for longer than max_misses frames
+    radars = dual_radar_layout(20.0, 22.5, 1.0, 60.0)
+    res = run_tracking_scenario(radars, 20, 200, 0.05, (-20.0, 0.0, 20.0, 20.0), pd=0.9, clutter_per_frame=2.0, seed=1)
+    print(f"Passage, 20 targets: {res['frame_time_mean']*1e3:.2f} ms/frame, continuity {res['track_continuity']*100:.1f}%, "
+          f"fragmentation {res['fragmentation']:.2f}, false tracks {res['false_tracks']}")
+
+    # Load test: 5000 targets, all in view
+    wide = [radar_pose(-1.0, 250.0, 0.0, 90.0, 1e4)]
+    res = run_tracking_scenario(wide, 5000, 40, 0.05, (0.0, 0.0, 500.0, 500.0), seed=1)
+    print(f"5000 targets: {res['frame_time_mean']*1e3:.1f} ms/frame (max {res['frame_time_max']*1e3:.1f}), "
+          f"continuity {res['track_continuity']*100:.1f}%, fragmentation {res['fragmentation']:.2f}")
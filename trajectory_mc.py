@@ -0,0 +1,183 @@
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from coverage_engine import radar_coverage_mask
+
+# Walker speeds are clipped at this fraction of the mean speed
+MIN_SPEED_FRACTION = 0.3
+
+
+# --- Lanes ---
+def lane(x0, y0, x1, y1, width, name=""):
+    """A walking lane from (x0, y0) to (x1, y1); trajectories start anywhere across its width."""
+    return {"x0": x0, "y0": y0, "x1": x1, "y1": y1, "width": width, "name": name}
+
+
+def passage_lanes(radar_sep, r_max, n_lanes=5, direction="across", margin=2.0):
+    """Parallel lanes through the dual-radar passage.
+
+    "across": walking along X at evenly spaced heights between the radars.
+    "along": walking from Radar 1 towards Radar 2, lanes spread over X.
+    Lanes start and end outside r_max so every crossing is complete.
+    """
+    lanes = []
+    if direction == "across":
+        width = radar_sep / n_lanes
+        reach = r_max + margin
+        for i in range(n_lanes):
+            y = width * (i + 0.5)
+            lanes.append(lane(-reach, y, reach, y, width, f"y = {y:.1f} m"))
+    else:
+        span = r_max
+        width = 2 * span / n_lanes
+        for i in range(n_lanes):
+            x = -span + width * (i + 0.5)
+            lanes.append(lane(x, -margin, x, radar_sep + margin, width, f"x = {x:.1f} m"))
+    return lanes
+
+
+# --- Monte Carlo Core ---
+def _simulate_chunk(job):
+    """Process-pool worker: walks n trajectories of one lane, returns (dwell_any, dwell_dual) in seconds."""
+    radars, ln, n, speed_mean, speed_std, heading_std_deg, dt, max_time, mem_budget_mb, seed = job
+    rng = np.random.default_rng(seed)
+
+    length = math.hypot(ln["x1"] - ln["x0"], ln["y1"] - ln["y0"])
+    ux, uy = (ln["x1"] - ln["x0"]) / length, (ln["y1"] - ln["y0"]) / length
+    offset = rng.uniform(-ln["width"] / 2, ln["width"] / 2, n)
+
+    # Walker state: position, heading relative to the lane, speed, progress along the lane
+    px = ln["x0"] - uy * offset
+    py = ln["y0"] + ux * offset
+    heading = np.zeros(n)
+    speed = np.clip(rng.normal(speed_mean, speed_std, n), MIN_SPEED_FRACTION * speed_mean, None)
+    progress = np.zeros(n)
+
+    dwell_any = np.zeros(n)
+    dwell_dual = np.zeros(n)
+    sigma = math.radians(heading_std_deg) * math.sqrt(dt)
+
+    # Steps per block so that (radars x walkers x steps) temporaries fit the budget
+    block = max(1, int(mem_budget_mb * 2**20 // (n * (len(radars) * 20 + 48))))
+    n_steps = int(math.ceil(max_time / dt))
+    k = np.arange(1, block + 1, dtype=np.float32)
+    live = np.arange(n)
+    for s0 in range(0, n_steps, block):
+        s = min(block, n_steps - s0)
+        step = (speed[live] * dt).astype(np.float32)[:, None]
+        if sigma > 0:
+            h = heading[live, None] + np.cumsum(rng.normal(0.0, sigma, (len(live), s)), axis=1).astype(np.float32)
+            along = np.cos(h) * step
+            lateral = np.sin(h) * step
+            x = px[live, None] + np.cumsum(along * ux - lateral * uy, axis=1)
+            y = py[live, None] + np.cumsum(along * uy + lateral * ux, axis=1)
+            prog = progress[live, None] + np.cumsum(along, axis=1)
+            heading[live] = h[:, -1]
+        else:
+            # Straight walk: closed form, no per-step trigonometry
+            along = np.broadcast_to(step, (len(live), s))
+            dist = step * k[:s]
+            x = px[live, None] + ux * dist
+            y = py[live, None] + uy * dist
+            prog = progress[live, None] + dist
+        active = (prog - along) < length                   # still inside the lane at step start
+
+        count = np.sum(radar_coverage_mask(radars, x, y), axis=0)
+        dwell_any[live] += np.count_nonzero(active & (count >= 1), axis=1) * dt
+        dwell_dual[live] += np.count_nonzero(active & (count >= 2), axis=1) * dt
+
+        px[live], py[live], progress[live] = x[:, -1], y[:, -1], prog[:, -1]
+        # Only walkers still inside the lane are stepped further
+        live = live[progress[live] < length]
+        if len(live) == 0:
+            break
+
+    return dwell_any, dwell_dual
+
+
+def simulate_trajectories(radars, lanes, n_per_lane=20000, speed_mean=1.4, speed_std=0.3, heading_std_deg=0.0,
+                          dt=0.05, min_dwell=0.5, chunk_size=4096, mem_budget_mb=64, n_workers=1, seed=None):
+    """Monte Carlo dwell times of walkers crossing the coverage along each lane.
+
+    Each walker starts at a random point across the lane width with a random
+    speed and walks until it has progressed the lane length (or for the
+    straight crossing time at the clipped minimum speed,
+    MIN_SPEED_FRACTION * speed_mean, which bounds wandering random walks). heading_std_deg > 0 turns straight paths into
+    random walks (heading diffusion in deg/sqrt(s)). Coverage membership of
+    all walkers and time steps is evaluated in blocked broadcast passes;
+    chunks of chunk_size walkers can be spread over a process pool
+    (n_workers=1 runs serially). Results are reproducible for a given seed
+    regardless of n_workers.
+
+    Returns one dict per lane with the dwell-time samples (any / dual /
+    single coverage) and the probability that a walker is seen for less
+    than min_dwell seconds (miss) by any radar or by both.
+    """
+    jobs, owners = [], []
+    for li, ln in enumerate(lanes):
+        length = math.hypot(ln["x1"] - ln["x0"], ln["y1"] - ln["y0"])
+        # Horizon from the slowest (clipped) walker plus one step, so straight crossings always finish the lane
+        max_time = length / (MIN_SPEED_FRACTION * speed_mean) + dt
+        for c0 in range(0, n_per_lane, chunk_size):
+            jobs.append((radars, ln, min(chunk_size, n_per_lane - c0), speed_mean, speed_std, heading_std_deg,
+                         dt, max_time, mem_budget_mb))
+            owners.append(li)
+    seeds = np.random.SeedSequence(seed).spawn(len(jobs))
+    jobs = [job + (sq,) for job, sq in zip(jobs, seeds)]
+
+    if n_workers == 1:
+        results = list(map(_simulate_chunk, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            results = list(pool.map(_simulate_chunk, jobs))
+
+    out = []
+    for li, ln in enumerate(lanes):
+        dwell_any = np.concatenate([r[0] for r, o in zip(results, owners) if o == li])
+        dwell_dual = np.concatenate([r[1] for r, o in zip(results, owners) if o == li])
+        out.append({
+            "lane": ln,
+            "dwell_any": dwell_any,
+            "dwell_dual": dwell_dual,
+            "dwell_single": dwell_any - dwell_dual,
+            "miss_probability": np.mean(dwell_any < min_dwell),
+            "dual_miss_probability": np.mean(dwell_dual < min_dwell),
+            "dwell_any_p10": np.percentile(dwell_any, 10),
+            "dwell_any_median": np.median(dwell_any),
+            "dwell_dual_median": np.median(dwell_dual),
+        })
+    return out
+
+
+if __name__ == "__main__":
+    import time
+    from coverage_engine import dual_radar_layout
+
+    print("--- Debugging Trajectory Monte Carlo ---")
+
+    radars = dual_radar_layout(20.0, 22.5, 1.0, 60.0)
+    lanes = passage_lanes(20.0, 22.5, n_lanes=5, direction="across")
+
+    t0 = time.time()
+    res = simulate_trajectories(radars, lanes, n_per_lane=20000, seed=0)
+    print(f"Straight, 100k walkers: {time.time() - t0:.1f} s")
+    for r in res:
+        print(f"{r['lane']['name']:>10}: median dwell {r['dwell_any_median']:.2f} s (dual {r['dwell_dual_median']:.2f} s), "
+              f"P_miss {r['miss_probability']:.4f}, P_miss(dual) {r['dual_miss_probability']:.3f}")
+
+    # Straight walker through the middle: dwell equals chord length / speed
+    one = simulate_trajectories(radars, [lane(-30, 10, 30, 10, 0.0)], n_per_lane=1, speed_std=0.0, dt=0.01)[0]
+    print(f"Chord check: dwell {one['dwell_any'][0]:.2f} s")
+
+    # Slowest walkers (speed clipped at MIN_SPEED_FRACTION) reach the end of a lane that ends inside coverage
+    slow = simulate_trajectories(radars, [lane(-30, 10, 10, 10, 0.0)], n_per_lane=2000, speed_std=2.0, seed=0)[0]
+    x_in = -one["dwell_any"][0] * 1.4 / 2
+    print(f"Clipped speeds: max dwell {slow['dwell_any'].max():.2f} s vs "
+          f"{(10 - x_in) / (MIN_SPEED_FRACTION * 1.4):.2f} s from entry to lane end at minimum speed")
+
+    t0 = time.time()
+    res = simulate_trajectories(radars, lanes, n_per_lane=20000, heading_std_deg=10.0, n_workers=4, seed=0)
+    print(f"Random walk, 100k walkers, 4 workers: {time.time() - t0:.1f} s, "
+          f"P_miss per lane: {[round(float(r['miss_probability']), 4) for r in res]}")
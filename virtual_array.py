@@ -0,0 +1,120 @@
+import numpy as np
+
+from array_factor import array_weights
+from result_cache import LRUCache, memoize
+
+# Deduplicated T-Shape virtual arrays, shared by all sessions
+VIRTUAL_CACHE = LRUCache(maxsize=4)
+
+
+# --- Compact Integer Types ---
+def _int_type(lo, hi):
+    """int16 when [lo, hi] fits, else int32."""
+    return np.int16 if np.iinfo(np.int16).min <= lo and hi <= np.iinfo(np.int16).max else np.int32
+
+
+# --- MIMO Virtual Array ---
+def build_virtual_array(tx_ix, tx_iy, rx_ix, rx_iy, tx_weights=None, rx_weights=None):
+    """Deduplicated MIMO virtual array on an integer lattice.
+
+    TX and RX element positions are integer offsets on a common (dx, dy)
+    lattice; every TX/RX pair gives a virtual element at tx + rx. Pairs
+    landing on the same lattice point are merged. Returns a dict of compact
+    arrays, one entry per unique virtual element:
+        ix, iy        int16/int32 lattice offsets from (ix0, iy0)
+        multiplicity  smallest unsigned type, number of pairs merged
+        tx, rx        int16/int32 index of the first contributing pair
+        weight        float32 sum of tx_weight * rx_weight over merged pairs
+                      (only when weights are given; else use virtual_weights)
+    plus ix0, iy0, n_pairs and nbytes (footprint of the arrays).
+    """
+    tx_ix, tx_iy = np.asarray(tx_ix, dtype=np.int64), np.asarray(tx_iy, dtype=np.int64)
+    rx_ix, rx_iy = np.asarray(rx_ix, dtype=np.int64), np.asarray(rx_iy, dtype=np.int64)
+    n_tx, n_rx = len(tx_ix), len(rx_ix)
+
+    # Lattice extent of the virtual aperture, then one int64 key per pair (TX-major)
+    ix0, iy0 = tx_ix.min() + rx_ix.min(), tx_iy.min() + rx_iy.min()
+    span_y = tx_iy.max() + rx_iy.max() - iy0 + 1
+    keys = ((tx_ix[:, np.newaxis] + rx_ix[np.newaxis, :] - ix0) * span_y
+            + (tx_iy[:, np.newaxis] + rx_iy[np.newaxis, :] - iy0)).ravel()
+    uniq, first, inverse, counts = np.unique(keys, return_index=True, return_inverse=True, return_counts=True)
+    del keys
+
+    ix, iy = np.divmod(uniq, span_y)
+    off_t = _int_type(0, max(int(ix.max()), int(iy.max())))
+    idx_t = _int_type(0, max(n_tx, n_rx))
+    va = {
+        "ix": ix.astype(off_t),
+        "iy": iy.astype(off_t),
+        "multiplicity": counts.astype(np.min_scalar_type(int(counts.max()))),
+        "tx": (first // n_rx).astype(idx_t),
+        "rx": (first % n_rx).astype(idx_t),
+        "ix0": int(ix0),
+        "iy0": int(iy0),
+        "n_pairs": n_tx * n_rx,
+    }
+    if tx_weights is not None or rx_weights is not None:
+        w_tx = np.ones(n_tx) if tx_weights is None else np.asarray(tx_weights, dtype=float)
+        w_rx = np.ones(n_rx) if rx_weights is None else np.asarray(rx_weights, dtype=float)
+        va["weight"] = np.bincount(inverse, weights=np.outer(w_tx, w_rx).ravel()).astype(np.float32)
+    va["nbytes"] = sum(v.nbytes for v in va.values() if isinstance(v, np.ndarray))
+    return va
+
+
+def t_shape_virtual_array(n_rx, n_tx, rx_weights=None, tx_weights=None):
+    """Virtual array of the T-Shape: RX row along x (lattice dx = RX spacing), TX column along y
+    going down from the top element (lattice dy = TX spacing)."""
+    return build_virtual_array(np.zeros(n_tx, dtype=np.int64), -np.arange(n_tx), np.arange(n_rx),
+                               np.zeros(n_rx, dtype=np.int64), tx_weights, rx_weights)
+
+
+@memoize(VIRTUAL_CACHE)
+def cached_t_shape_virtual_array(n_rx, n_tx, w_name="None"):
+    """t_shape_virtual_array with the named window on both arms (arrays read-only, cached)."""
+    va = t_shape_virtual_array(n_rx, n_tx, array_weights(n_rx, w_name), array_weights(n_tx, w_name))
+    for v in va.values():
+        if isinstance(v, np.ndarray):
+            v.flags.writeable = False
+    return va
+
+
+def virtual_weights(va):
+    """Per-element weights: the tapered sums if built with weights, else the multiplicities."""
+    return va["weight"] if "weight" in va else va["multiplicity"].astype(np.float32)
+
+
+if __name__ == "__main__":
+    import time
+    from planar_pattern import planar_u_pattern
+
+    print("--- Debugging Virtual Array ---")
+
+    # T-Shape, 3 and 10 modules per arm (440 mm modules, 2.5 mm RX / 4.074 mm TX pitch)
+    for mods in (3, 10):
+        n_rx, n_tx = int(mods * 440 / 2.5), int(mods * 440 / 4.074)
+        t0 = time.time()
+        va = t_shape_virtual_array(n_rx, n_tx)
+        float_pairs = va["n_pairs"] * 2 * 8
+        print(f"{mods:>2} modules: {n_rx} RX x {n_tx} TX -> {len(va['ix'])} virtual elements "
+              f"({va['ix'].dtype}, mult {va['multiplicity'].dtype}) {va['nbytes'] / 2**20:.1f} MB "
+              f"vs {float_pairs / 2**20:.1f} MB float64 (x, y), {time.time() - t0:.2f} s")
+
+    # Cached builder: one np.unique pass per (N_rx, N_tx, window), later reruns are lookups
+    t0 = time.time()
+    for _ in range(10):
+        va = cached_t_shape_virtual_array(1760, 1080, "Hamming")
+    print(f"Cached builder: {(time.time() - t0) / 10 * 1e3:.1f} ms per call, cache {VIRTUAL_CACHE.stats()}")
+
+    # Same pattern as the explicit rectangular grid
+    n_rx, n_tx = 528, 324
+    w_rx, w_tx = array_weights(n_rx, "Hamming"), array_weights(n_tx, "Hamming")
+    va = t_shape_virtual_array(n_rx, n_tx, w_rx, w_tx)
+    gx, gy = np.meshgrid(np.arange(n_rx), np.arange(n_tx))
+    ref = planar_u_pattern(gx.ravel(), gy.ravel(), np.outer(w_tx, w_rx).ravel(), 2048, 1024)
+    pat = planar_u_pattern(va["ix"], va["iy"], virtual_weights(va), 2048, 1024)
+    print(f"Pattern vs meshgrid: max rel diff {np.max(np.abs(pat - ref)) / ref.max():.1e}")
+
+    # Collinear MIMO with overlap: 3 TX at 2d, 4 RX at d -> 8 unique positions out of 12 pairs
+    va = build_virtual_array([0, 2, 4], [0, 0, 0], [0, 1, 2, 3], [0, 0, 0, 0])
+    print(f"Collinear: ix {va['ix'].tolist()}, multiplicity {va['multiplicity'].tolist()}, "
+          f"tx {va['tx'].tolist()}, rx {va['rx'].tolist()}")
@@ -0,0 +1,111 @@
+import numpy as np
+
+from coverage_engine import _stack_radars, coverage_bounds, raster_grid
+
+
+# --- 3D Volumetric Coverage ---
+def _slab_count(p, xx, yy, z):
+    """Number of radars seeing each voxel of one horizontal slab at height z, shape (rows, nx)."""
+    dx = xx - p["x"]
+    dy = yy - p["y"]
+    dz = np.float32(z) - p["h"]
+    rho2 = dx * dx + dy * dy
+    rho = np.sqrt(rho2)                                  # horizontal distance
+    slant = np.sqrt(rho2 + dz * dz)
+    del rho2
+
+    azimuth_ok = (dx * p["bx"] + dy * p["by"]) >= rho * p["cos_scan"]
+    elev = np.arctan2(dz, rho)
+    elevation_ok = (elev >= p["el_lo"]) & (elev <= p["el_hi"])
+    del elev, rho
+
+    visible = np.all(p["hp"][:, :, 0] * xx + p["hp"][:, :, 1] * yy >= p["hp"][:, :, 2], axis=1)
+    seen = azimuth_ok & elevation_ok & (slant >= p["blind"]) & (slant <= p["r_max"]) & visible
+    return np.sum(seen, axis=0, dtype=np.uint8)
+
+
+def calculate_volume_coverage(radars, grid_res, z_max, z_res, target_height, bounds=None, mem_budget_mb=64):
+    """Calculates 3D voxel coverage of radars mounted at height with tilt and elevation limits.
+
+    Voxels are (grid_res x grid_res x z_res) with centers from z_res/2 up to
+    z_max. A voxel is seen by a radar when its slant range is within
+    [blind_zone_m, r_max], its azimuth within the scan limit, its elevation
+    within tilt +- elev_scan_deg and it passes the occlusion half-planes.
+    The volume is processed one horizontal slab at a time (rows chunked
+    within mem_budget_mb), so memory does not grow with z_max.
+
+    Returns volume_k (volume seen by at least k radars), the covered area per
+    slab height, and the coverage-count raster and area_k of the slice at
+    target_height.
+    """
+    n = len(radars)
+    if bounds is None:
+        bounds = coverage_bounds(radars)
+    x_grid, y_grid = raster_grid(bounds, grid_res)
+    z_levels = z_res / 2 + z_res * np.arange(int(round(z_max / z_res)))
+
+    p = _stack_radars(radars)
+    nx = len(x_grid)
+    bytes_per_cell = n * 40 + 8
+    rows = max(1, int(mem_budget_mb * 2**20 // (max(nx, 1) * bytes_per_cell)))
+    xx = x_grid[np.newaxis, np.newaxis, :]
+
+    def slab_hist(z, raster=None):
+        hist = np.zeros(n + 1, dtype=np.int64)
+        for r0 in range(0, len(y_grid), rows):
+            count = _slab_count(p, xx, y_grid[np.newaxis, r0:r0 + rows, np.newaxis], z)
+            hist += np.bincount(count.ravel(), minlength=n + 1)
+            if raster is not None:
+                raster[r0:r0 + rows] = count
+        return hist
+
+    cell_area = grid_res * grid_res
+    hist_k = np.zeros((len(z_levels), n + 1), dtype=np.int64)
+    for i, z in enumerate(z_levels):
+        hist_k[i] = slab_hist(z)
+    # area_k[z, k]: area of slab z seen by at least k radars
+    area_k_by_z = np.cumsum(hist_k[:, ::-1], axis=1)[:, ::-1] * cell_area
+
+    target_raster = np.zeros((len(y_grid), nx), dtype=np.uint8)
+    target_area_k = np.cumsum(slab_hist(target_height, target_raster)[::-1])[::-1] * cell_area
+
+    volume_k = area_k_by_z.sum(axis=0) * z_res
+    return {
+        "volume_k": volume_k,
+        "volume_union": volume_k[1] if n > 0 else 0.0,
+        "z_levels": z_levels,
+        "area_union_by_z": area_k_by_z[:, 1] if n > 0 else np.zeros(len(z_levels)),
+        "area_k_by_z": area_k_by_z,
+        "target_height": target_height,
+        "target_area_k": target_area_k,
+        "target_count": target_raster,
+        "x_grid": x_grid,
+        "y_grid": y_grid,
+    }
+
+
+if __name__ == "__main__":
+    import time
+    from coverage_engine import dual_radar_layout, radar_pose, calculate_multi_coverage
+
+    print("--- Debugging Volume Coverage ---")
+
+    # Flat check: radars at the slice height with an open elevation beam match the 2D raster
+    flat = dual_radar_layout(20.0, 22.5, 1.0, 60.0, height=1.0)
+    res = calculate_volume_coverage(flat, 0.1, 2.0, 0.5, 1.0)
+    ref = calculate_multi_coverage(flat, 0.1)
+    print(f"Slice @ 1 m: {res['target_area_k'][1]:.2f} m² vs 2D {ref['area_union']:.2f} m²")
+
+    # Ceiling mount, tilted down
+    mounted = dual_radar_layout(20.0, 22.5, 1.0, 60.0, height=2.5, tilt_deg=10.0, elev_scan_deg=15.0)
+    res = calculate_volume_coverage(mounted, 0.1, 3.0, 0.25, 1.0)
+    print(f"Mounted: union volume {res['volume_union']:.1f} m³, slice @ 1 m {res['target_area_k'][1]:.1f} m², "
+          f"dual {res['target_area_k'][2]:.1f} m²")
+    print("Area by height:", " ".join(f"{z:.2f}:{a:.0f}" for z, a in zip(res["z_levels"], res["area_union_by_z"])))
+
+    # Large hall: 100 m x 100 m x 5 m at 0.1 m
+    hall = [radar_pose(x, 0.0, 90.0, 60.0, 60.0, 0.5, height=4.0, tilt_deg=5.0, elev_scan_deg=20.0) for x in (20.0, 50.0, 80.0)]
+    t0 = time.time()
+    res = calculate_volume_coverage(hall, 0.1, 5.0, 0.1, 1.0, bounds=(0.0, 0.0, 100.0, 100.0))
+    print(f"Hall: {len(res['z_levels'])} slabs x {res['target_count'].size} cells in {time.time() - t0:.1f} s, "
+          f"union volume {res['volume_union']:.0f} m³")